@@ -0,0 +1,605 @@
+import csv
+import os
+import sqlite3
+import sys
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+CSV_FIELDNAMES = ["timestamp", "formatted_time", "title", "url", "summary", "section"]
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+ARCHIVE_SUFFIX = ".parquet"
+ARCHIVE_COLUMNS = ["timestamp", "title", "url", "summary"]
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT NOT NULL,
+    summary TEXT NOT NULL DEFAULT '',
+    section TEXT NOT NULL DEFAULT ''
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_url ON articles (url);
+CREATE INDEX IF NOT EXISTS idx_articles_timestamp ON articles (timestamp);
+"""
+
+# URL indexes already read by this process: index path -> ((size, mtime), URLs)
+_url_indexes = {}
+
+INSERT_ARTICLE_SQL = (
+    "INSERT OR IGNORE INTO articles (timestamp, title, url, summary, section) VALUES (?, ?, ?, ?, ?)"
+)
+
+
+def canonical_url(url):
+    """
+    Normalize an article URL so the same story always maps to the same key.
+    Drops query strings and fragments and lowercases the scheme and host.
+    """
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, "", ""))
+
+
+def is_sqlite_path(path):
+    """
+    True if the store path points at a SQLite database rather than a CSV file.
+    """
+    return str(path).lower().endswith(SQLITE_SUFFIXES)
+
+
+def is_archive_path(path):
+    """
+    True if the store path points at a day-partitioned Parquet archive directory.
+    """
+    return str(path).lower().rstrip("/\\").endswith(ARCHIVE_SUFFIX)
+
+
+def archive_fallback_csv(root):
+    """
+    CSV file used instead of a Parquet archive when pyarrow isn't installed.
+    """
+    return str(root).rstrip("/\\")[:-len(ARCHIVE_SUFFIX)] + ".csv"
+
+
+def has_pyarrow():
+    """
+    True if pyarrow can be imported.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def to_utc(timestamp):
+    """
+    Convert a datetime to aware UTC. Naive datetimes are treated as UTC like the crawler's fallback.
+    """
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
+
+
+def to_utc_iso(timestamp):
+    """
+    Format a datetime as fixed-width UTC ISO 8601 text, so timestamps compare
+    correctly as strings.
+    """
+    return to_utc(timestamp).isoformat(timespec="microseconds")
+
+
+def url_index_path(filename):
+    """
+    Path of the on-disk URL index kept next to a CSV file.
+    """
+    return filename + ".urls"
+
+
+def keyword_index_path(store):
+    """
+    Path of the keyword index (see keyword_index.py) kept next to any article store.
+    """
+    return str(store).rstrip("/\\") + ".keywords.db"
+
+
+def iter_csv_rows(filename):
+    """
+    Yield each data row of an article CSV as a dict, skipping header lines.
+    """
+    with open(filename, mode="r", newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file, fieldnames=CSV_FIELDNAMES):
+            if row["timestamp"] == "timestamp":
+                continue
+            yield row
+
+
+def rebuild_url_index(filename):
+    """
+    Rebuild the URL index from the CSV itself. Only needed once per file.
+    """
+    seen = set()
+    if os.path.exists(filename):
+        for row in iter_csv_rows(filename):
+            if row["url"]:
+                seen.add(canonical_url(row["url"]))
+
+    with open(url_index_path(filename), mode="w", encoding="utf-8") as file:
+        for url in seen:
+            file.write(url + "\n")
+
+    return seen
+
+
+def index_stat(index_path):
+    """
+    (size, modification time) of a URL index file, to tell whether it changed.
+    """
+    stat = os.stat(index_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def load_url_index(filename):
+    """
+    Return the set of canonical URLs already stored in the CSV. The set stays
+    in memory, and the index file is only read again when its size or
+    modification time changes, e.g. because another process appended to it.
+    """
+    index_path = url_index_path(filename)
+
+    if not os.path.exists(filename):
+        _url_indexes.pop(index_path, None)
+        if os.path.exists(index_path):
+            os.remove(index_path)
+        return set()
+
+    if not os.path.exists(index_path):
+        seen = rebuild_url_index(filename)
+    else:
+        cached = _url_indexes.get(index_path)
+        if cached is not None and cached[0] == index_stat(index_path):
+            return cached[1]
+        with open(index_path, mode="r", encoding="utf-8") as file:
+            seen = {line.rstrip("\n") for line in file if line.strip()}
+
+    _url_indexes[index_path] = (index_stat(index_path), seen)
+    return seen
+
+
+def save_to_csv(articles, filename="reuters_articles.csv"):
+    """
+    Append articles that aren't stored yet to a CSV file, keyed on canonical URL.
+    Writes headers if missing or if file doesn't exist. Returns the new articles.
+    """
+    seen = load_url_index(filename)
+    new_urls = set()
+    new_articles = []
+
+    for article in articles:
+        url = canonical_url(article["url"])
+        if url in seen or url in new_urls:
+            continue
+        new_urls.add(url)
+        new_articles.append(dict(article, url=url))
+
+    if not new_articles:
+        return []
+
+    write_headers = True
+
+    if os.path.exists(filename):
+        with open(filename, mode="r", encoding="utf-8") as file:
+            first_line = file.readline().strip().lower()
+            # Older files have the same header without the trailing section column
+            if first_line.startswith("timestamp,formatted_time,"):
+                write_headers = False
+
+    try:
+        with open(filename, mode="a", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=CSV_FIELDNAMES)
+
+            if write_headers:
+                writer.writeheader()
+
+            for article in new_articles:
+                writer.writerow({
+                    "timestamp": article["timestamp"].isoformat(),
+                    "formatted_time": article["timestamp"].strftime("%B %d, %Y @ %I:%M %p"),
+                    "title": article["title"],
+                    "url": article["url"],
+                    "summary": article["summary"],
+                    "section": article.get("section") or ""
+                })
+
+        with open(url_index_path(filename), mode="a", encoding="utf-8") as file:
+            for article in new_articles:
+                file.write(article["url"] + "\n")
+
+    except Exception as e:
+        print(f"Error writing to CSV: {e}")
+        raise
+
+    # The in-memory set only learns the URLs once they are on disk
+    seen.update(new_urls)
+    _url_indexes[url_index_path(filename)] = (index_stat(url_index_path(filename)), seen)
+    return new_articles
+
+
+def compact_csv(filename="reuters_articles.csv"):
+    """
+    Rewrite a CSV written by the old append-only crawler so it keeps only the
+    first row seen for each canonical URL. Returns (rows kept, rows dropped).
+    """
+    seen = set()
+    kept = dropped = 0
+    tmp_path = filename + ".tmp"
+
+    with open(tmp_path, mode="w", newline="", encoding="utf-8") as out:
+        writer = csv.DictWriter(out, fieldnames=CSV_FIELDNAMES)
+        writer.writeheader()
+
+        for row in iter_csv_rows(filename):
+            url = canonical_url(row["url"] or "")
+            if not url or url in seen:
+                dropped += 1
+                continue
+            seen.add(url)
+            writer.writerow(dict(row, url=url))
+            kept += 1
+
+    os.replace(tmp_path, filename)
+    rebuild_url_index(filename)
+    return kept, dropped
+
+
+def connect_sqlite(path="reuters_articles.db"):
+    """
+    Open the SQLite article store, creating the table and indexes if needed.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SQLITE_SCHEMA)
+
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(articles)")}
+    if "section" not in columns:
+        conn.execute("ALTER TABLE articles ADD COLUMN section TEXT NOT NULL DEFAULT ''")
+
+    return conn
+
+
+def connect_sqlite_readonly(path="reuters_articles.db"):
+    """
+    Open an existing SQLite article store for reading. A missing file raises
+    FileNotFoundError instead of leaving an empty database behind.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No such SQLite store: {path!r}")
+    return sqlite3.connect(Path(path).resolve().as_uri() + "?mode=ro", uri=True)
+
+
+def save_to_sqlite(articles, path="reuters_articles.db"):
+    """
+    Insert articles into the SQLite store, ignoring URLs it already holds.
+    Returns the new articles.
+    """
+    new_articles = []
+    conn = connect_sqlite(path)
+
+    try:
+        with conn:
+            for article in articles:
+                url = canonical_url(article["url"])
+                cursor = conn.execute(INSERT_ARTICLE_SQL, (
+                    to_utc_iso(article["timestamp"]),
+                    article["title"],
+                    url,
+                    article["summary"],
+                    article.get("section") or ""
+                ))
+                if cursor.rowcount:
+                    new_articles.append(dict(article, url=url))
+    except sqlite3.Error as e:
+        print(f"Error writing to SQLite: {e}")
+        raise
+    finally:
+        conn.close()
+
+    return new_articles
+
+
+def select_articles_sql(since=None, until=None):
+    """
+    Build the query for articles in [since, until), in the order they were stored.
+    Uses the timestamp index, so the cost depends on the window rather than the history.
+    """
+    sql = "SELECT timestamp, title, url, summary FROM articles"
+    conditions = []
+    params = []
+
+    if since is not None:
+        conditions.append("timestamp >= ?")
+        params.append(to_utc_iso(since))
+    if until is not None:
+        conditions.append("timestamp < ?")
+        params.append(to_utc_iso(until))
+
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+
+    # The unary + keeps SQLite from scanning the rowid order instead of the timestamp index
+    return sql + " ORDER BY +id", params
+
+
+def partition_path(root, day):
+    """
+    Path of the archive file holding one UTC day.
+    """
+    return os.path.join(root, f"{day.isoformat()}.parquet")
+
+
+def list_partitions(root, since=None, until=None):
+    """
+    Return the archive files whose UTC day overlaps [since, until), oldest first.
+    Days outside the window are pruned without being opened.
+    """
+    if not os.path.isdir(root):
+        return []
+
+    first_day = to_utc(since).date() if since is not None else None
+    last_day = (to_utc(until) - timedelta(microseconds=1)).date() if until is not None else None
+
+    partitions = []
+    for name in sorted(os.listdir(root)):
+        if not name.endswith(".parquet"):
+            continue
+        try:
+            day = date.fromisoformat(name[:-len(".parquet")])
+        except ValueError:
+            continue
+        if first_day is not None and day < first_day:
+            continue
+        if last_day is not None and day > last_day:
+            continue
+        partitions.append(os.path.join(root, name))
+
+    return partitions
+
+
+def load_archive_url_index(root):
+    """
+    Return the set of URLs stored in the archive, rebuilding the index file if
+    missing. Like load_url_index, the set stays in memory until the file changes.
+    """
+    import pyarrow.parquet as pq
+
+    index_path = os.path.join(root, "urls.txt")
+
+    if os.path.exists(index_path):
+        cached = _url_indexes.get(index_path)
+        if cached is not None and cached[0] == index_stat(index_path):
+            return cached[1]
+        with open(index_path, mode="r", encoding="utf-8") as file:
+            seen = {line.rstrip("\n") for line in file if line.strip()}
+    else:
+        seen = set()
+        for path in list_partitions(root):
+            seen.update(pq.read_table(path, columns=["url"]).column("url").to_pylist())
+
+        os.makedirs(root, exist_ok=True)
+        with open(index_path, mode="w", encoding="utf-8") as file:
+            for url in seen:
+                file.write(url + "\n")
+
+    _url_indexes[index_path] = (index_stat(index_path), seen)
+    return seen
+
+
+def save_to_parquet(articles, root="reuters_articles.parquet"):
+    """
+    Add articles to the Parquet archive, one file per UTC day. Falls back to a
+    CSV next to the archive when pyarrow isn't installed. Returns the new articles.
+    """
+    if not has_pyarrow():
+        print("pyarrow is not installed; saving to CSV instead.")
+        return save_to_csv(articles, archive_fallback_csv(root))
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    index_path = os.path.join(root, "urls.txt")
+    seen = load_archive_url_index(root)
+    new_urls = set()
+    new_articles = []
+    by_day = {}
+
+    for article in articles:
+        url = canonical_url(article["url"])
+        if url in seen or url in new_urls:
+            continue
+        new_urls.add(url)
+        article = dict(article, url=url)
+        new_articles.append(article)
+        by_day.setdefault(to_utc(article["timestamp"]).date(), []).append(article)
+
+    if not new_articles:
+        return []
+
+    schema = pa.schema([
+        ("timestamp", pa.timestamp("us", tz="UTC")),
+        ("title", pa.string()),
+        ("url", pa.string()),
+        ("summary", pa.string()),
+        ("section", pa.string())
+    ])
+
+    # URLs already in a day file but missing from urls.txt, e.g. after a crash
+    # between swapping the file in and appending to the index
+    stored_urls = set()
+
+    try:
+        for day, day_articles in by_day.items():
+            path = partition_path(root, day)
+            existing = None
+            if os.path.exists(path):
+                existing = pq.read_table(path)
+                existing_urls = set(existing.column("url").to_pylist())
+                stored_urls.update(a["url"] for a in day_articles if a["url"] in existing_urls)
+                day_articles = [a for a in day_articles if a["url"] not in existing_urls]
+                if not day_articles:
+                    continue
+
+            table = pa.Table.from_pydict({
+                "timestamp": [to_utc(a["timestamp"]) for a in day_articles],
+                "title": [a["title"] for a in day_articles],
+                "url": [a["url"] for a in day_articles],
+                "summary": [a["summary"] for a in day_articles],
+                "section": [a.get("section") or "" for a in day_articles]
+            }, schema=schema)
+
+            if existing is not None:
+                if "section" not in existing.column_names:
+                    existing = existing.append_column("section", pa.array([""] * existing.num_rows, pa.string()))
+                table = pa.concat_tables([existing.select(schema.names).cast(schema), table])
+
+            # Parquet files can't be appended to, so rewrite the day and swap it in
+            pq.write_table(table, path + ".tmp")
+            os.replace(path + ".tmp", path)
+
+        with open(index_path, mode="a", encoding="utf-8") as file:
+            for article in new_articles:
+                file.write(article["url"] + "\n")
+
+    except (OSError, pa.ArrowException) as e:
+        print(f"Error writing to Parquet archive: {e}")
+        raise
+
+    # The in-memory set only learns the URLs once they are on disk
+    seen.update(new_urls)
+    _url_indexes[index_path] = (index_stat(index_path), seen)
+    return [article for article in new_articles if article["url"] not in stored_urls]
+
+
+def save_articles(articles, path="reuters_articles.csv"):
+    """
+    Save articles to whichever store the path points at. Returns the new articles.
+    Write errors are raised, so the crawler doesn't record the pages as stored.
+    """
+    if is_sqlite_path(path):
+        return save_to_sqlite(articles, path)
+    if is_archive_path(path):
+        return save_to_parquet(articles, path)
+    return save_to_csv(articles, path)
+
+
+def migrate_csv_to_sqlite(csv_path="reuters_articles.csv", db_path="reuters_articles.db", batch_size=10000):
+    """
+    Import an existing article CSV into the SQLite store. Rows already present
+    (or repeated in the CSV) are skipped. Returns (rows imported, rows skipped).
+    """
+    conn = connect_sqlite(db_path)
+    before = conn.total_changes
+    total = 0
+    batch = []
+
+    try:
+        with conn:
+            for row in iter_csv_rows(csv_path):
+                total += 1
+                try:
+                    timestamp = datetime.fromisoformat(row["timestamp"])
+                except (TypeError, ValueError):
+                    continue
+                if not row["url"]:
+                    continue
+
+                batch.append((
+                    to_utc_iso(timestamp),
+                    row["title"] or "",
+                    canonical_url(row["url"]),
+                    row["summary"] or "",
+                    row["section"] or ""
+                ))
+                if len(batch) >= batch_size:
+                    conn.executemany(INSERT_ARTICLE_SQL, batch)
+                    batch = []
+
+            if batch:
+                conn.executemany(INSERT_ARTICLE_SQL, batch)
+
+        imported = conn.total_changes - before
+    finally:
+        conn.close()
+
+    return imported, total - imported
+
+
+def migrate_csv_to_parquet(csv_path="reuters_articles.csv", root="reuters_articles.parquet", batch_size=10000):
+    """
+    Import an existing article CSV into the Parquet archive. Returns (rows imported, rows skipped).
+    """
+    imported = total = 0
+    batch = []
+
+    for row in iter_csv_rows(csv_path):
+        total += 1
+        try:
+            timestamp = datetime.fromisoformat(row["timestamp"])
+        except (TypeError, ValueError):
+            continue
+        if not row["url"]:
+            continue
+
+        batch.append({
+            "timestamp": timestamp,
+            "title": row["title"] or "",
+            "url": row["url"],
+            "summary": row["summary"] or "",
+            "section": row["section"] or ""
+        })
+        if len(batch) >= batch_size:
+            imported += len(save_to_parquet(batch, root))
+            batch = []
+
+    if batch:
+        imported += len(save_to_parquet(batch, root))
+
+    return imported, total - imported
+
+
+def main(argv=None):
+    """
+    Maintenance commands for the article store.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reuters article store maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compact = commands.add_parser("compact", help="Drop duplicate rows from an article CSV")
+    compact.add_argument("csv", nargs="?", default="reuters_articles.csv")
+
+    migrate = commands.add_parser("migrate", help="Import an article CSV into a SQLite store or Parquet archive")
+    migrate.add_argument("csv", nargs="?", default="reuters_articles.csv")
+    migrate.add_argument("db", nargs="?", default="reuters_articles.db",
+                         help="Target .db/.sqlite database or .parquet archive directory")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compact":
+        kept, dropped = compact_csv(args.csv)
+        print(f"Kept {kept} unique articles, dropped {dropped} duplicate rows.")
+    elif args.command == "migrate":
+        if is_archive_path(args.db):
+            imported, skipped = migrate_csv_to_parquet(args.csv, args.db)
+        else:
+            imported, skipped = migrate_csv_to_sqlite(args.csv, args.db)
+        print(f"Imported {imported} articles into {args.db}, skipped {skipped} rows.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
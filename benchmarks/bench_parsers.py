@@ -0,0 +1,77 @@
+"""
+Compare the story-card parser backends on saved homepage snapshots.
+
+    python benchmarks/bench_parsers.py [snapshot.html ...]
+
+Every backend must extract exactly the same cards; the script exits non-zero
+if they don't. Peak memory comes from tracemalloc, which only sees Python
+allocations, so the tree lxml builds in C is not included in its figure.
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fixtures import load_snapshots  # noqa: E402
+from reuters_crawler import extract_story_cards, has_lxml  # noqa: E402
+
+
+def best_time(func, repeat):
+    """
+    Fastest of `repeat` runs, in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func):
+    """
+    Peak Python heap allocated while running func, in bytes.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("snapshots", nargs="*", help="Saved homepage HTML files (default: benchmarks/snapshots/*.html)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    backends = ["bs4", "strainer"]
+    if has_lxml():
+        backends.append("lxml")
+    else:
+        print("lxml is not installed; only the BeautifulSoup backends can be measured.")
+
+    ok = True
+    for name, html in load_snapshots(args.snapshots):
+        reference = extract_story_cards(html, "bs4")
+        print(f"{name} ({len(html) // 1024} KB, {len(reference)} cards)")
+
+        for backend in backends:
+            if extract_story_cards(html, backend) != reference:
+                print(f"  {backend}: output differs from bs4")
+                ok = False
+            seconds = best_time(lambda: extract_story_cards(html, backend), args.repeat)
+            if backend == "bs4":
+                baseline = seconds
+            peak = peak_memory(lambda: extract_story_cards(html, backend))
+            print(f"  {backend:<9} {seconds * 1000:7.1f} ms  {baseline / seconds:5.1f}x  peak {peak / 1024:8.0f} KB")
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
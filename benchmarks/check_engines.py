@@ -0,0 +1,109 @@
+"""
+Check that the pandas and pure-Python digest engines render the same HTML.
+
+    python benchmarks/check_engines.py [store ...]
+
+Each store (CSV, SQLite or Parquet) is rendered by both engines over all its
+articles and over its last --days days. Without stores, a synthetic CSV is
+generated, with edge-case rows appended: repeated URLs and header lines,
+missing titles and summaries, naive and unparseable timestamps, and markup
+that needs escaping. The script exits non-zero if any page differs.
+"""
+import argparse
+import csv
+import os
+import shutil
+import sys
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_DIR))
+
+from run_benchmarks import synthetic_csv  # noqa: E402
+
+EDGE_ROWS = [
+    ["timestamp", "formatted_time", "title", "url", "summary", "section"],
+    ["2025-06-19T23:59:59.45Z", "", "Nvidia <b>AI</b> chip & \"deal\"", "/markets/edge-1/", "", "markets"],
+    ["2025-06-19T23:59:59.45Z", "", "Repeated URL", "/markets/edge-1/", "Biden talks", "markets"],
+    ["2025-06-19T12:00:00", "", "Naive timestamp election", "https://www.reuters.com/edge-2/", "NA", "world"],
+    ["not a date", "", "Bad timestamp", "/edge-3/", "oil", "world"],
+    ["2025-06-19T11:00:00+02:00", "", "", "/edge-4/", "Lakers NBA", "sports"],
+    ["2025-06-19T10:00:00Z", "", "Missing URL climate", "", "wildfire drought", "world"],
+]
+
+
+def edge_case_csv(path, rows):
+    """
+    A synthetic article CSV with EDGE_ROWS appended.
+    """
+    synthetic_csv(path, rows)
+    with open(path, "a", newline="", encoding="utf-8") as file:
+        csv.writer(file).writerows(EDGE_ROWS)
+
+
+def first_difference(a, b):
+    """
+    Offset of the first character where a and b differ.
+    """
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return i
+    return min(len(a), len(b))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("stores", nargs="*", help="Article stores (default: a synthetic CSV with edge cases)")
+    parser.add_argument("--rows", type=int, default=20000, help="Rows of the synthetic CSV (default: 20000)")
+    parser.add_argument("--days", type=int, default=3, help="Length of the windowed check in days (default: 3)")
+    parser.add_argument("--top-n", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    stores = [os.path.abspath(store) for store in args.stores]
+    topics_path = REPO_DIR / "topics.json"
+
+    # The digest logs to ./logs and reads ./digest.css, so run from a scratch directory
+    workdir = tempfile.mkdtemp(prefix="check_engines-")
+    shutil.copy(REPO_DIR / "digest.css", workdir)
+    os.chdir(workdir)
+
+    import generate_digest
+    from streaming_digest import stream_articles
+
+    if not stores:
+        stores = [os.path.join(workdir, "synthetic.csv")]
+        edge_case_csv(stores[0], args.rows)
+
+    topics = generate_digest.load_topics(str(topics_path))
+    ok = True
+    for store in stores:
+        df = generate_digest.load_articles(store)
+        windows = [("all", None)]
+        if not df.empty:
+            windows.append((f"last {args.days} days", df["timestamp"].max() - timedelta(days=args.days)))
+
+        for name, since in windows:
+            frame = generate_digest.load_articles(store, since=since)
+            pandas_html = generate_digest.generate_digest_html(frame, topics, top_n=args.top_n, title=name)
+            python_html = generate_digest.generate_digest_html(
+                stream_articles(store, topics, args.top_n, since=since), topics, top_n=args.top_n, title=name
+            )
+            if pandas_html == python_html:
+                print(f"{Path(store).name} ({name}): identical, {len(pandas_html) // 1024} KB")
+                continue
+
+            ok = False
+            i = first_difference(pandas_html, python_html)
+            print(f"{Path(store).name} ({name}): differs at character {i}")
+            print(f"  pandas: {pandas_html[max(i - 80, 0):i + 80]!r}")
+            print(f"  python: {python_html[max(i - 80, 0):i + 80]!r}")
+
+    shutil.rmtree(workdir, ignore_errors=True)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
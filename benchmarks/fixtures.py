@@ -0,0 +1,69 @@
+"""
+Offline inputs for the benchmarks: saved Reuters homepage snapshots, plus a
+synthetic page with the same story-card markup when none have been saved.
+"""
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+SNAPSHOT_DIR = Path(__file__).resolve().parent / "snapshots"
+
+WORDS = (
+    "Nvidia AI chip semiconductor OpenAI Lakers NBA soccer football Olympics Biden "
+    "Trump election congress senate climate weather drought wildfire emissions markets "
+    "stocks bonds oil rates bank said officials week report growth talks deal"
+).split()
+
+
+def synthetic_homepage(cards=60, filler_blocks=400, seed=0):
+    """
+    Build a homepage-sized document with `cards` story cards between blocks
+    of unrelated markup, like the navigation, scripts and ads of the real page.
+    """
+    rnd = random.Random(seed)
+    now = datetime(2025, 6, 20, 12, 0, tzinfo=timezone.utc)
+
+    def sentence(n):
+        return " ".join(rnd.choice(WORDS) for _ in range(n))
+
+    def filler(i):
+        return (
+            f'<div class="nav-item__{i}" data-index="{i}"><a href="/section/{i}/">{sentence(3)}</a>'
+            f'<script type="application/json">{{"id": {i}, "slot": "ad-{i}"}}</script></div>'
+        )
+
+    def card(i):
+        published = now - timedelta(minutes=rnd.randint(0, 24 * 60), seconds=rnd.randint(0, 59))
+        fraction = rnd.choice(["", ".4", ".45", ".123"])
+        summary = "" if i % 4 == 0 else f'<p data-testid="Description" class="text__summary">{sentence(25)}</p>'
+        return (
+            f'<li class="story-collection__story__{i} story-card__tpl-{i % 3}">'
+            f'<div class="media-story-card__placement"><img src="/resizer/{i}.jpg" alt=""></div>'
+            f'<a data-testid="TitleLink" href="/world/{sentence(1).lower()}-story-{seed}-{i}-2025-06-20/">'
+            f'<span data-testid="TitleHeading">{sentence(10)} &amp; more</span></a>'
+            f'{summary}<time datetime="{published.strftime("%Y-%m-%dT%H:%M:%S")}{fraction}Z">'
+            f'{published.strftime("%B %d, %Y")}</time></li>'
+        )
+
+    head = "".join(filler(i) for i in range(filler_blocks // 2))
+    tail = "".join(filler(i) for i in range(filler_blocks // 2, filler_blocks))
+    body = "".join(card(i) for i in range(cards))
+    return (
+        f"<!DOCTYPE html><html><head><title>Reuters</title></head><body>"
+        f"{head}<ul class=\"story-collection__list\">{body}</ul>{tail}</body></html>"
+    )
+
+
+def load_snapshots(paths=None):
+    """
+    Return [(name, html)] for the given files, or every snapshot saved in
+    benchmarks/snapshots. Falls back to one synthetic page if there are none,
+    which is all a fresh checkout has: no recorded page is shipped.
+    """
+    paths = [Path(p) for p in paths] if paths else sorted(SNAPSHOT_DIR.glob("*.html"))
+    if not paths:
+        print("No snapshots in benchmarks/snapshots, so parsing is measured on synthetic markup only. "
+              "Record real pages with `reuters_crawler.py --save-html benchmarks/snapshots`.", file=sys.stderr)
+        return [("synthetic", synthetic_homepage())]
+    return [(path.name, path.read_text(encoding="utf-8")) for path in paths]
@@ -0,0 +1,282 @@
+"""
+Benchmark the crawler and digest hot paths offline and report the results as JSON.
+
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --sizes 10000 100000 --repeat 3
+
+Parsing runs on the homepage snapshots in benchmarks/snapshots (record them
+with `reuters_crawler.py --save-html benchmarks/snapshots`). None are
+shipped, so until some are recorded it runs on a synthetic page only. The
+storage and digest benchmarks run on synthetic article CSVs of each
+requested size, generated once into --data-dir and reused by later runs.
+
+Each result has the wall time (best of --repeat), the throughput in items
+per second and, unless --no-memory is given, the peak Python heap measured
+with tracemalloc in a separate run. The startup results time a fresh
+interpreter importing each module, with the part spent on imports, and the
+load_articles results also give the loaded DataFrame's bytes per row.
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+from fixtures import WORDS, load_snapshots  # noqa: E402
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+
+def synthetic_csv(path, rows, seed=0):
+    """
+    Write an article CSV in the crawler's format with `rows` unique articles
+    spread over the 30 days before 2025-06-20.
+    """
+    rnd = random.Random(seed)
+    start = datetime(2025, 5, 21, tzinfo=timezone.utc)
+    sections = ["home", "world", "business", "markets", "technology"]
+
+    def sentence(n):
+        return " ".join(rnd.choice(WORDS) for _ in range(n))
+
+    with open(path, mode="w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["timestamp", "formatted_time", "title", "url", "summary", "section"])
+        for i in range(rows):
+            timestamp = start + timedelta(seconds=30 * 24 * 3600 * i // rows, microseconds=rnd.choice([0, 400000, 450000]))
+            writer.writerow([
+                timestamp.isoformat(),
+                timestamp.strftime("%B %d, %Y @ %I:%M %p"),
+                sentence(10),
+                f"https://www.reuters.com/world/story-{seed}-{i}/",
+                "" if i % 4 == 0 else sentence(25),
+                sections[i % len(sections)]
+            ])
+
+
+def synthetic_articles(count, prefix, seed=0):
+    """
+    Article dicts as parse_articles returns them, with URLs unique to `prefix`.
+    """
+    rnd = random.Random(seed)
+    now = datetime(2025, 6, 20, tzinfo=timezone.utc)
+    return [{
+        "title": " ".join(rnd.choice(WORDS) for _ in range(10)),
+        "timestamp": now - timedelta(minutes=i),
+        "url": f"https://www.reuters.com/world/{prefix}-{i}/",
+        "summary": " ".join(rnd.choice(WORDS) for _ in range(25)),
+        "section": "home"
+    } for i in range(count)]
+
+
+def measure(func, repeat=1, memory=True):
+    """
+    Return (best wall time in seconds, peak traced bytes or None).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return best, peak
+
+
+class Runner:
+    """
+    Collects results and prints a one-line summary of each to stderr.
+    """
+
+    def __init__(self, repeat, memory):
+        self.repeat = repeat
+        self.memory = memory
+        self.results = []
+
+    def run(self, name, func, items, unit="rows", **params):
+        seconds, peak = measure(func, self.repeat, self.memory)
+        return self.record(name, seconds, peak, items, unit, **params)
+
+    def record(self, name, seconds, peak, items, unit="rows", **params):
+        result = {
+            "benchmark": name,
+            **params,
+            "items": items,
+            "unit": unit,
+            "seconds": round(seconds, 6),
+            "throughput": round(items / seconds, 1) if seconds else None,
+            "peak_memory_bytes": peak
+        }
+        self.results.append(result)
+
+        label = " ".join([name] + [f"{k}={v}" for k, v in params.items()])
+        memory = f"  peak {peak / 2 ** 20:8.1f} MB" if peak is not None else ""
+        print(f"{label:<50} {seconds * 1000:10.1f} ms {result['throughput']:>14,.0f} {unit}/s{memory}",
+              file=sys.stderr)
+        return result
+
+
+def startup_time(module, repeat=1):
+    """
+    (best wall time of a fresh interpreter importing `module`, seconds of
+    that run spent on imports), both in seconds. module=None starts an
+    interpreter that imports nothing, as the baseline.
+    """
+    from startup_profile import import_seconds, parse_import_times
+
+    code = f"import sys; sys.path.insert(0, {str(REPO_DIR)!r})" + (f"; import {module}" if module else "")
+    best = (float("inf"), None)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                                capture_output=True, text=True, check=True)
+        seconds = time.perf_counter() - start
+        best = min(best, (seconds, import_seconds(parse_import_times(result.stderr.splitlines()))))
+    return best
+
+
+def package_version(name):
+    try:
+        module = __import__(name)
+    except ImportError:
+        return None
+    return getattr(module, "__version__", None)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Synthetic CSV sizes in rows (default: 10000 100000 1000000)")
+    parser.add_argument("--snapshots", nargs="*", help="Homepage HTML files (default: benchmarks/snapshots/*.html)")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per benchmark; the best is reported")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory runs")
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "reuters-digest-bench"),
+                        help="Where synthetic CSVs are generated and cached")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    snapshots = load_snapshots(args.snapshots)
+    output = os.path.abspath(args.output) if args.output else None
+
+    # The crawler and digest log to ./logs and the digest reads ./digest.css,
+    # so run from the data directory instead of the working tree
+    os.makedirs(args.data_dir, exist_ok=True)
+    shutil.copy(REPO_DIR / "digest.css", args.data_dir)
+    os.chdir(args.data_dir)
+
+    runner = Runner(args.repeat, not args.no_memory)
+
+    # Before this process imports anything itself; each run is a fresh interpreter
+    for module in [None, "article_store", "keyword_matcher", "generate_digest", "reuters_crawler",
+                   "digest_service"]:
+        seconds, imports = startup_time(module, max(args.repeat, 3))
+        runner.record("startup", seconds, None, 1, unit="processes", module=module or "(none)",
+                      import_seconds=round(imports, 6))
+
+    import reuters_crawler
+    import generate_digest
+    from article_store import save_to_csv
+    from keyword_matcher import KeywordMatcher, has_pyahocorasick
+
+    topics = generate_digest.load_topics(str(REPO_DIR / "topics.json"))
+    all_keywords = [kw for topic_kw in topics.values() for kw in topic_kw]
+
+    backends = ["bs4", "strainer"] + (["lxml"] if reuters_crawler.has_lxml() else [])
+    for name, html in snapshots:
+        cards = len(reuters_crawler.extract_story_cards(html, "bs4"))
+        for backend in backends:
+            runner.run("parse_articles", lambda: reuters_crawler.parse_articles(html, backend=backend),
+                       cards, unit="articles", snapshot=name, backend=backend)
+
+    stamps = [f"2025-06-20T12:{i % 60:02d}:{i % 59:02d}.{i % 1000}Z" for i in range(100000)]
+    runner.run("safe_parse_iso8601", lambda: [reuters_crawler.safe_parse_iso8601(s) for s in stamps],
+               len(stamps), unit="timestamps")
+
+    for rows in args.sizes:
+        path = os.path.join(args.data_dir, f"articles_{rows}.csv")
+        if not os.path.exists(path):
+            print(f"Generating {path}...", file=sys.stderr)
+            synthetic_csv(path, rows)
+
+        # Appends 100 new and 100 already stored articles; the CSV is copied so
+        # the cached file stays the same size across runs
+        store = path + ".store.csv"
+        shutil.copy(path, store)
+        if os.path.exists(store + ".urls"):
+            os.remove(store + ".urls")
+        save_to_csv(synthetic_articles(100, "warmup"), store)
+        batches = iter([synthetic_articles(100, f"batch-{i}") + synthetic_articles(100, "warmup")
+                        for i in range(args.repeat + 1)])
+        runner.run("save_to_csv", lambda: save_to_csv(next(batches), store), 200, unit="articles", rows=rows)
+
+        result = runner.run("load_articles", lambda: generate_digest.load_articles(path), rows, rows=rows)
+        df = generate_digest.load_articles(path)
+        result["bytes_per_row"] = round(df.memory_usage(deep=True).sum() / max(len(df), 1), 1)
+
+        runner.run("filter_by_keywords",
+                   lambda: [generate_digest.filter_by_keywords(df, keywords) for keywords in topics.values()],
+                   rows, rows=rows, topics=len(topics))
+        for backend in ["find"] + (["ahocorasick"] if has_pyahocorasick() else []):
+            matcher = KeywordMatcher(topics, backend=backend)
+            runner.run("keyword_matcher", lambda: matcher.match(df), rows, rows=rows, backend=backend)
+        runner.run("get_top_trending_by_hotness",
+                   lambda: generate_digest.get_top_trending_by_hotness(df, all_keywords, top_n=3),
+                   rows, rows=rows)
+        runner.run("generate_digest_html", lambda: generate_digest.generate_digest_html(df, topics), rows, rows=rows)
+
+    report = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "packages": {name: package_version(name) for name in ("pandas", "numpy", "bs4", "lxml", "pyarrow", "ahocorasick")},
+            "repeat": args.repeat,
+            "sizes": args.sizes
+        },
+        "results": runner.results
+    }
+
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
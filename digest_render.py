@@ -0,0 +1,162 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from functools import lru_cache
+from html import escape
+from itertools import chain
+from pathlib import Path
+
+DIGEST_HEAD_TEMPLATE = (
+    "<html>\n<head>\n<meta charset='UTF-8'>\n<title>{title}</title>\n"
+    "<style>\n{css}\n</style>\n</head>\n<body>\n<h1>📊 {title}</h1>"
+)
+ARTICLE_TEMPLATE = (
+    "<li><p class='time'>[{time}]</p> "
+    "<a href='{url}' target='_blank' rel='noopener noreferrer'>{title}</a>{summary}\n</li>"
+)
+SUMMARY_TEMPLATE = "\n<p class='summary'>{summary}</p>"
+TOPIC_TEMPLATE = (
+    "\n<details>\n<summary>{topic} ({count} article{plural})</summary>\n<ul style='margin-top: 10px;'>"
+)
+
+# Bump when the rendered HTML of a section changes, to invalidate cached sections
+RENDER_CACHE_VERSION = 1
+
+# Seconds a cached section no digest used is kept, so that digests sharing a
+# cache (the service and one-shot runs) don't prune each other's sections
+RENDER_CACHE_MAX_AGE = 24 * 3600
+
+@lru_cache(maxsize=1)
+def time_strings():
+    """
+    The digest's time string for each minute of the day, e.g. "9:05 AM".
+    """
+    return tuple(
+        datetime(2000, 1, 1, hour, minute).strftime("%I:%M %p").lstrip("0")
+        for hour in range(24) for minute in range(60)
+    )
+
+def section_fingerprint(header, definition, urls):
+    """
+    Hash of everything a rendered section depends on: the renderer version,
+    its header, the topic definition and the URLs of its articles in order.
+    """
+    digest = hashlib.sha256(f"{RENDER_CACHE_VERSION}\n{header}\n{definition}\n".encode("utf-8"))
+    digest.update("\n".join(urls).encode("utf-8"))
+    return digest.hexdigest()
+
+def open_cached_section(path):
+    """
+    The cached section fragment at path, opened for reading and marked as
+    used, or None if it isn't cached (or was just pruned by another digest).
+    """
+    try:
+        f = open(path, "r", encoding="utf-8", newline="")
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return f
+
+def iter_cached_section(f, chunk_size=1 << 20):
+    """
+    Yields an opened cached section fragment a chunk at a time, then closes it.
+    """
+    with f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+def iter_cached_render(pieces, path):
+    """
+    Yields freshly rendered pieces while saving them to the section cache.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        for piece in pieces:
+            f.write(piece)
+            yield piece
+    os.replace(tmp_path, path)
+
+def prune_render_cache(render_cache, keep, max_age=RENDER_CACHE_MAX_AGE):
+    """
+    Removes cached sections the last digest didn't use and no digest has
+    used for max_age seconds.
+    """
+    cutoff = time.time() - max_age
+    for entry in os.scandir(render_cache):
+        if not entry.name.endswith(".html") or entry.name[:-len(".html")] in keep:
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            # Removed or still open in another digest
+            pass
+
+def digest_sections(topics, top_n, top_recent, top_hot, topic_positions):
+    """
+    The digest's sections as (header, footer, definition, articles) tuples:
+    the top trending articles by time and by hotness, then each topic's
+    articles. Empty trending sections are left out.
+    """
+    sections = []
+    if len(top_recent):
+        sections.append((f"\n<h2>🔥 Top {top_n} Trending Articles</h2>\n<ul>", "\n</ul>", "time", top_recent))
+
+    if len(top_hot):
+        sections.append((f"\n<h2>🔥 Top {top_n} Trending Articles (By Hotness Score)</h2>\n<ul>", "\n</ul>",
+                         json.dumps([kw for topic_kw in topics.values() for kw in topic_kw]), top_hot))
+
+    for topic, positions in topic_positions.items():
+        article_count = len(positions)
+        header = TOPIC_TEMPLATE.format(
+            topic=escape(topic.title()), count=article_count, plural="s" if article_count != 1 else ""
+        )
+        sections.append((header, "\n</ul>\n</details>", json.dumps(topics[topic]), positions))
+    return sections
+
+def iter_sections_html(sections, section_urls, render_articles, render_cache=None):
+    """
+    Yields each section's HTML. With a render_cache directory, sections whose
+    fingerprint (over section_urls(articles)) is unchanged since the last run
+    are copied from the cache. The others are rendered by a single
+    render_articles(list of articles per stale section) call.
+    """
+    cache_paths = [None] * len(sections)
+    if render_cache:
+        os.makedirs(render_cache, exist_ok=True)
+        cache_paths = [
+            os.path.join(render_cache, section_fingerprint(header, definition, section_urls(articles)) + ".html")
+            for header, _, definition, articles in sections
+        ]
+    # Cached sections are opened up front, so a fragment another digest
+    # prunes meanwhile is still read in full, and one already gone is rendered
+    cached = [path and open_cached_section(path) for path in cache_paths]
+    logging.info(f"Rendering {cached.count(None)} of {len(sections)} digest sections")
+
+    try:
+        rendered = iter(render_articles([articles for (*_, articles), f in zip(sections, cached) if not f]))
+
+        for i, ((header, footer, _, _), path, f) in enumerate(zip(sections, cache_paths, cached)):
+            if f:
+                cached[i] = None
+                yield from iter_cached_section(f)
+                continue
+
+            pieces = chain([header], next(rendered), [footer])
+            yield from (iter_cached_render(pieces, path) if path else pieces)
+    finally:
+        for f in cached:
+            if f:
+                f.close()
+
+    if render_cache:
+        prune_render_cache(render_cache, {Path(path).stem for path in cache_paths})
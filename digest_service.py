@@ -0,0 +1,222 @@
+import logging
+import os
+import queue
+import threading
+
+import numpy as np
+import pandas as pd
+
+from generate_digest import (
+    DIGEST_COLUMNS, compact_articles, digest_window, load_articles, load_topics, utc_timestamp, window_mode,
+    write_digest_html
+)
+from keyword_matcher import KeywordMatches, keyword_matcher
+from reuters_crawler import (
+    PARSER_BACKENDS, load_http_cache, load_section_intervals, run_daemon, select_sections, truncate_large_log
+)
+
+# Replaces the log file of whichever of the crawler and the digest was imported first
+LOG_FILE = "logs/service.log"
+
+
+def articles_frame(articles, columns):
+    """
+    DataFrame of crawled article dicts with the given columns, timestamps in UTC
+    like the ones loaded from a store.
+    """
+    df = compact_articles(pd.DataFrame(articles).reindex(columns=columns))
+    df["timestamp"] = pd.to_datetime([utc_timestamp(article["timestamp"]) for article in articles], utc=True)
+    return df
+
+
+class DigestModel:
+    """
+    The articles of the current digest window and their keyword matches, kept
+    in memory. New articles are appended and matched on their own, and
+    articles leaving the window are dropped, so the store is read only once.
+    """
+
+    def __init__(self, store, topics, window="day", top_n=3, render_cache="digest_cache",
+                 out_path="daily_digest.html"):
+        self.store = store
+        self.topics = topics
+        self.window = window
+        self.top_n = top_n
+        self.render_cache = render_cache
+        self.out_path = out_path
+        self.matcher = keyword_matcher(topics)
+
+        self.since, self.title = digest_window(window)
+        if os.path.exists(store):
+            self.df = load_articles(store, since=self.since).reset_index(drop=True)
+        else:
+            self.df = articles_frame([], DIGEST_COLUMNS)
+        self.matches = self.matcher.match(self.df)
+        logging.info(f"Loaded {len(self.df)} articles from {store} into the digest model")
+
+    def add(self, articles):
+        """
+        Append newly stored articles inside the window. Returns how many were added.
+        """
+        fresh = articles_frame(articles, self.df.columns)
+        if self.since is not None:
+            fresh = fresh[fresh["timestamp"] >= utc_timestamp(self.since)]
+        fresh = fresh[~fresh["url"].isin(self.df["url"])].reset_index(drop=True)
+        if fresh.empty:
+            return 0
+
+        offset = len(self.df)
+        matches = self.matcher.match(fresh)
+        self.df = pd.concat([self.df, fresh], ignore_index=True) if offset else fresh
+        self.matches = KeywordMatches(
+            self.matcher,
+            self.df.index,
+            np.concatenate([self.matches.rows, matches.rows + offset]),
+            np.concatenate([self.matches.keyword_ids, matches.keyword_ids])
+        )
+        return len(fresh)
+
+    def roll_window(self):
+        """
+        Move the window to the current time and drop the articles that fell
+        out of it. Returns True if the digest changed.
+        """
+        since, title = digest_window(self.window)
+        changed = title != self.title
+        self.since, self.title = since, title
+        if since is None or self.df.empty:
+            return changed
+
+        keep = (self.df["timestamp"] >= utc_timestamp(since)).to_numpy()
+        if keep.all():
+            return changed
+
+        # Old row position -> new one, for the matches of the rows kept
+        positions = np.cumsum(keep) - 1
+        kept = keep[self.matches.rows]
+        self.df = self.df[keep].reset_index(drop=True)
+        self.matches = KeywordMatches(self.matcher, self.df.index, positions[self.matches.rows[kept]],
+                                      self.matches.keyword_ids[kept])
+        return True
+
+    def render(self):
+        """
+        Write the digest HTML. Sections that didn't change are copied from
+        the render cache.
+        """
+        write_digest_html(self.df, self.topics, self.out_path, self.matches, top_n=self.top_n,
+                          render_cache=self.render_cache, title=self.title)
+
+
+def run_service(model, sections, interval=60, section_intervals=None, jitter=0.1, concurrency=4,
+                cache=None, backend="auto", snapshot_dir=None, idle_check=60, stop=None):
+    """
+    Crawl on a schedule in a background thread and hand each crawl's new
+    articles through a queue to `model`, re-rendering the digest as soon as
+    they arrive. Articles arriving together are rendered once. Every
+    `idle_check` seconds without articles the window is rolled forward.
+    Runs until KeyboardInterrupt, or until the `stop` threading.Event is set
+    and the articles already crawled are in the digest. If the crawler thread
+    dies, its error is raised once the articles it did crawl are rendered.
+    """
+    new_articles = queue.Queue()
+    stop = stop or threading.Event()
+    crawler_errors = []
+
+    def crawl():
+        try:
+            run_daemon(sections, model.store, interval, section_intervals, jitter, concurrency, cache, backend,
+                       snapshot_dir, stop, new_articles.put)
+        except BaseException as error:
+            logging.exception("Crawler thread stopped")
+            crawler_errors.append(error)
+
+    crawler = threading.Thread(target=crawl, name="crawler", daemon=True)
+
+    model.render()
+    crawler.start()
+    try:
+        while crawler.is_alive() or not new_articles.empty():
+            try:
+                articles = new_articles.get(timeout=idle_check if crawler.is_alive() else 0)
+            except queue.Empty:
+                if model.roll_window():
+                    model.render()
+                continue
+
+            while True:
+                try:
+                    articles = articles + new_articles.get_nowait()
+                except queue.Empty:
+                    break
+
+            model.roll_window()
+            added = model.add(articles)
+            logging.info(f"Added {added} of {len(articles)} new articles to the digest")
+            model.render()
+    finally:
+        stop.set()
+        crawler.join()
+
+    if crawler_errors:
+        raise RuntimeError("The crawler thread stopped unexpectedly") from crawler_errors[0]
+
+
+def main(argv=None):
+    """
+    Run the crawler and the digest in one process.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Crawl Reuters continuously and keep the digest up to date")
+    parser.add_argument("--store", default="reuters_articles.csv",
+                        help="Article CSV file, SQLite database (.db/.sqlite) or Parquet archive (.parquet)")
+    parser.add_argument("--sections", nargs="*", metavar="SECTION",
+                        help="Crawl these sections from sections.json (all of them if none are named)")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Maximum number of section pages fetched at the same time")
+    parser.add_argument("--interval", type=float, default=60, metavar="SECONDS",
+                        help="Seconds between crawls of a section without its own interval in sections.json")
+    parser.add_argument("--jitter", type=float, default=0.1, metavar="FRACTION",
+                        help="Randomly vary each interval by up to this fraction of it")
+    parser.add_argument("--no-http-cache", action="store_true",
+                        help="Always download and parse pages, even if they look unchanged")
+    parser.add_argument("--parser", choices=PARSER_BACKENDS, default="auto",
+                        help="HTML parser for story cards (auto: lxml when installed, else strainer)")
+    parser.add_argument("--window", type=window_mode, default="day",
+                        help="Articles to include: day (since local midnight, the default), week (since "
+                             "Monday), a rolling number of hours like 24h, or all")
+    parser.add_argument("--top-n", type=int, default=3,
+                        help="Number of articles in the top trending sections (default: 3)")
+    parser.add_argument("--render-cache", default="digest_cache", metavar="DIR",
+                        help="Reuse sections rendered earlier from DIR (default: digest_cache)")
+    parser.add_argument("--no-render-cache", action="store_true",
+                        help="Render every section from scratch")
+    args = parser.parse_args(argv)
+
+    os.makedirs("logs", exist_ok=True)
+    logging.basicConfig(filename=LOG_FILE, level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s",
+                        force=True)
+    truncate_large_log()
+    logging.info("Started digest service")
+    topics = load_topics()
+    if not topics:
+        print("No topics to process.")
+        return
+
+    sections = {"home": ""} if args.sections is None else select_sections(args.sections)
+    model = DigestModel(args.store, topics, args.window, args.top_n,
+                        None if args.no_render_cache else args.render_cache)
+    print(f"Loaded {len(model.df)} articles. Crawling {', '.join(sections)} every {args.interval:g}s "
+          f"(Ctrl+C to stop)...")
+
+    try:
+        run_service(model, sections, args.interval, load_section_intervals(), args.jitter, args.concurrency,
+                    None if args.no_http_cache else load_http_cache(), args.parser)
+    except KeyboardInterrupt:
+        logging.info("Stopped digest service")
+        print("Stopped.")
+
+
+if __name__ == "__main__":
+    main()
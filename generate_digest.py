@@ -1,9 +1,23 @@
-import pandas as pd
 import json
-from datetime import datetime
+from contextlib import closing
+from html import escape
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 import os
 import logging
+import hashlib
+import io
+import pickle
+
+from article_store import (
+    ARCHIVE_COLUMNS, CSV_FIELDNAMES, archive_fallback_csv, connect_sqlite_readonly, has_pyarrow,
+    is_archive_path, is_sqlite_path, list_partitions, select_articles_sql
+)
+from digest_render import (
+    ARTICLE_TEMPLATE, DIGEST_HEAD_TEMPLATE, RENDER_CACHE_VERSION, SUMMARY_TEMPLATE, digest_sections,
+    iter_sections_html, time_strings
+)
 
 # Ensure logs directory exists
 os.makedirs("logs", exist_ok=True)
@@ -14,13 +28,228 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s"
 )
 
-def load_articles(filename="reuters_articles.csv"):
-    columns = ["timestamp", "formatted_time", "title", "url", "summary"]
-    df = pd.read_csv(filename, names=columns, header=0)
-    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-    df = df.dropna(subset=["timestamp"])
+# The columns the digest reads; formatted_time and section are skipped when loading
+DIGEST_COLUMNS = ["timestamp", "title", "url", "summary"]
+TEXT_COLUMNS = ["title", "url", "summary"]
+
+@lru_cache(maxsize=1)
+def string_dtype():
+    """
+    dtype of the text columns: Arrow-backed strings that read missing values
+    as NaN, like the default object strings, when pandas and pyarrow support
+    them. Otherwise plain Python str objects.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if has_pyarrow():
+        try:
+            return pd.StringDtype("pyarrow", na_value=np.nan)
+        except TypeError:
+            pass
+    return str
+
+def compact_articles(df):
+    """
+    Store the text columns of loaded articles as string_dtype().
+    """
+    return df.astype({column: string_dtype() for column in TEXT_COLUMNS if column in df.columns})
+
+def parse_timestamps(values):
+    """
+    Parse stored ISO 8601 timestamps into UTC. Values without an offset come
+    from the crawler's utcnow() fallback, so they are UTC too.
+    """
+    import pandas as pd
+
+    if int(pd.__version__.split(".")[0]) >= 2:
+        return pd.to_datetime(values, errors="coerce", utc=True, format="ISO8601")
+    return pd.to_datetime(values, errors="coerce", utc=True)
+
+def utc_timestamp(value):
+    """
+    Convert a datetime to a UTC pandas Timestamp, treating naive values as UTC.
+    """
+    import pandas as pd
+
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+def load_articles(filename="reuters_articles.csv", since=None, until=None, incremental=False):
+    """
+    Load stored articles from a CSV file, a SQLite database (.db/.sqlite) or a
+    Parquet archive (.parquet), optionally limited to timestamps in [since, until).
+    With incremental=True a CSV is read from where the previous call stopped.
+    """
+    if is_sqlite_path(filename):
+        return load_articles_sqlite(filename, since, until)
+    if is_archive_path(filename):
+        if has_pyarrow():
+            return load_articles_parquet(filename, since, until)
+        filename = archive_fallback_csv(filename)
+
+    if incremental:
+        df = load_articles_incremental(filename, since)
+    else:
+        df = read_csv_articles(filename, since, until)
+
+    if since is not None:
+        df = df[df["timestamp"] >= utc_timestamp(since)]
+    if until is not None:
+        df = df[df["timestamp"] < utc_timestamp(until)]
+    return df
+
+def read_csv_articles(source, since=None, until=None, chunksize=100000):
+    """
+    Parse article rows from a CSV path or buffer, dropping bad timestamps and repeated URLs.
+    The file is read in chunks and only rows in [since, until) are kept from each, so
+    memory follows the size of the window rather than of the file.
+    """
+    import pandas as pd
+
+    try:
+        # Header lines are read as rows and dropped with the unparseable timestamps, so
+        # files whose older rows lack the section column load too. Columns the digest
+        # doesn't use are never materialized.
+        chunks = [
+            window_rows(chunk, since, until)
+            for chunk in pd.read_csv(source, names=CSV_FIELDNAMES, header=None, usecols=DIGEST_COLUMNS,
+                                     dtype=string_dtype(), chunksize=chunksize)
+        ]
+        df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+    except pd.errors.EmptyDataError:
+        df = compact_articles(pd.DataFrame(columns=DIGEST_COLUMNS))
+        df["timestamp"] = parse_timestamps(df["timestamp"])
+    # Files written before the deduplicating store can repeat the same story
+    return df.drop_duplicates(subset="url", keep="first")
+
+def window_rows(df, since=None, until=None):
+    """
+    Parse the timestamps of raw CSV rows and keep the rows in [since, until).
+    """
+    import pandas as pd
+
+    if since is not None:
+        since = utc_timestamp(since)
+        # ISO 8601 dates sort as text, and no UTC offset moves a row by a day or
+        # more, so rows dated earlier than the day before since are skipped unparsed
+        floor = (since - pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        df = df[df["timestamp"].str[:10] >= floor]
+
+    df = df.assign(timestamp=parse_timestamps(df["timestamp"])).dropna(subset=["timestamp"])
+    if since is not None:
+        df = df[df["timestamp"] >= since]
+    if until is not None:
+        df = df[df["timestamp"] < utc_timestamp(until)]
     return df
 
+def tail_signature(file, offset, length=1024):
+    """
+    Hash of the bytes just before offset, used to check that the part of the
+    file we already read hasn't been rewritten (e.g. by compaction).
+    """
+    start = max(0, offset - length)
+    file.seek(start)
+    return hashlib.sha1(file.read(offset - start)).hexdigest()
+
+def load_articles_incremental(filename="reuters_articles.csv", since=None, state_path=None):
+    """
+    Load a CSV by parsing only the rows appended since the last call. The byte
+    offset reached and the articles loaded so far are kept in a state file; rows
+    older than since are dropped from it, so later calls may not ask for an earlier since.
+    """
+    import pandas as pd
+
+    state_path = state_path or filename + ".state.pkl"
+    since = utc_timestamp(since) if since is not None else None
+    state = None
+    if os.path.exists(state_path):
+        try:
+            with open(state_path, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            logging.warning(f"Ignoring unreadable digest state {state_path}: {e}")
+
+    with open(filename, "rb") as file:
+        file.seek(0, os.SEEK_END)
+        size = file.tell()
+
+        offset, cached = 0, None
+        if (state and state["offset"] <= size and list(state["df"].columns) == DIGEST_COLUMNS
+                and (state["since"] is None or (since is not None and since >= state["since"]))
+                and tail_signature(file, state["offset"]) == state["signature"]):
+            offset, cached = state["offset"], state["df"]
+
+        file.seek(offset)
+        data = file.read()
+        # Leave a partially written last line for the next run
+        data = data[:data.rfind(b"\n") + 1]
+        end = offset + len(data)
+        signature = tail_signature(file, end)
+
+    new_df = read_csv_articles(io.BytesIO(data))
+    if cached is not None:
+        new_df = new_df[~new_df["url"].isin(cached["url"])]
+        df = pd.concat([cached, new_df], ignore_index=True) if not new_df.empty else cached
+    else:
+        df = new_df.reset_index(drop=True)
+
+    if since is not None:
+        df = df[df["timestamp"] >= since].reset_index(drop=True)
+
+    logging.info(f"Read {len(data)} new bytes ({len(new_df)} articles) from {filename}")
+
+    tmp_path = state_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"offset": end, "signature": signature, "since": since, "df": df}, f)
+    os.replace(tmp_path, state_path)
+
+    return df
+
+def load_articles_sqlite(filename="reuters_articles.db", since=None, until=None):
+    """
+    Load articles from the SQLite store with an indexed timestamp range query.
+    """
+    import pandas as pd
+
+    sql, params = select_articles_sql(since, until)
+    with closing(connect_sqlite_readonly(filename)) as conn:
+        df = pd.read_sql_query(sql, conn, params=params)
+    df["timestamp"] = parse_timestamps(df["timestamp"])
+    return compact_articles(df.dropna(subset=["timestamp"]))
+
+def load_articles_parquet(root="reuters_articles.parquet", since=None, until=None):
+    """
+    Load articles from the day-partitioned Parquet archive. Only the day files
+    overlapping the window are opened, and only the digest's columns are read.
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    filters = []
+    if since is not None:
+        filters.append(("timestamp", ">=", utc_timestamp(since).to_pydatetime()))
+    if until is not None:
+        filters.append(("timestamp", "<", utc_timestamp(until).to_pydatetime()))
+
+    tables = [
+        pq.read_table(path, columns=ARCHIVE_COLUMNS, filters=filters or None)
+        for path in list_partitions(root, since, until)
+    ]
+    if not tables:
+        return compact_articles(pd.DataFrame({
+            "timestamp": pd.Series([], dtype="datetime64[ns, UTC]"),
+            "title": pd.Series([], dtype=object),
+            "url": pd.Series([], dtype=object),
+            "summary": pd.Series([], dtype=object)
+        }))
+
+    df = pa.concat_tables(tables).to_pandas()
+    df["timestamp"] = df["timestamp"].dt.tz_convert("UTC")
+    # A crash while saving can leave a day file holding articles stored again later
+    return compact_articles(df.drop_duplicates(subset="url", keep="first"))
+
 def load_topics(filepath="topics.json"):
     try:
         with open(filepath, "r", encoding="utf-8") as f:
@@ -30,54 +259,111 @@ def load_topics(filepath="topics.json"):
         return {}
 
 def filter_by_keywords(df, keywords):
-    pattern = "|".join(keywords)
-    return df[
-        df["title"].str.contains(pattern, case=False, na=False) |
-        df["summary"].str.contains(pattern, case=False, na=False)
-    ]
+    from keyword_matcher import keyword_matcher
+
+    matches = keyword_matcher({"keywords": keywords}).match(df)
+    return df[matches.topic_mask("keywords")]
 
 def keyword_match_score(text, keywords):
     """
     Generate a 'hotness score' for.
     """
-    text_lower = text.lower()
-    return sum(text_lower.count(k.lower()) for k in keywords)
+    from keyword_matcher import keyword_matcher
+
+    return keyword_matcher({"keywords": keywords}).count(text)
 
-def get_top_trending_by_hotness(df, keywords, top_n=3):
+def topic_sections(df, topics, keyword_matches):
     """
-    Gets our top 3 trending articles by 'hotness'.
+    Row positions of each topic's articles from a single classification
+    pass: every row gets a bitmask of the topics it matches, rows are grouped
+    by mask, and each section takes the groups whose mask has its bit set.
+    Positions keep the order of df.
     """
-    df = df.copy()
+    import numpy as np
 
-    # Normalize recency: newest = 1.0, oldest = 0.0
-    latest = df["timestamp"].max()
-    earliest = df["timestamp"].min()
-    total_seconds = (latest - earliest).total_seconds()
+    masks, groups = np.unique(keyword_matches.topic_bitmask(), axis=0, return_inverse=True)
+    sections = {}
 
-    def recency_score(ts):
-        delta = (ts - earliest).total_seconds()
-        return delta / total_seconds if total_seconds else 1.0
+    for i, topic in enumerate(topics):
+        in_topic = (masks[:, i // 64] & np.uint64(1 << (i % 64))) != 0
+        if in_topic.any():
+            sections[topic] = np.flatnonzero(in_topic[groups.ravel()])
 
-    df["recency_score"] = df["timestamp"].apply(recency_score)
+    return sections
+
+def recency_scores(timestamps):
+    """
+    Normalize recency: newest = 1.0, oldest = 0.0. Works on the int64 ticks
+    of the column's own resolution, so it gives exactly the floats of
+    Timedelta.total_seconds() ratios.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if timestamps.empty:
+        return pd.Series([], index=timestamps.index, dtype="float64")
+
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_convert(None)
+    values = timestamps.to_numpy()
+    ticks = values.view("int64")
+    ticks_per_second = {"s": 1, "ms": 1e3, "us": 1e6, "ns": 1e9}[np.datetime_data(values.dtype)[0]]
+
+    earliest = ticks.min()
+    total_seconds = (ticks.max() - earliest) / ticks_per_second
+    if not total_seconds:
+        return pd.Series(1.0, index=timestamps.index)
+
+    return pd.Series((ticks - earliest) / ticks_per_second / total_seconds, index=timestamps.index)
+
+def hotness_scores(df, matches):
+    """
+    (recency_score, keyword_score, hotness) arrays for every row.
+    """
+    recency_score = recency_scores(df["timestamp"]).to_numpy()
 
     # Count keyword matches in title and summary
-    df["keyword_score"] = df.apply(
-        lambda row: keyword_match_score(str(row["title"]), keywords) +
-                    keyword_match_score(str(row["summary"]) if pd.notna(row["summary"]) else "", keywords),
-        axis=1
-    )
+    keyword_score = matches.scores().to_numpy()
 
     # Multiply for hotness
-    df["hotness"] = df["recency_score"] * df["keyword_score"]
+    return recency_score, keyword_score, recency_score * keyword_score
+
+def top_positions(values, top_n):
+    """
+    Index labels of the top_n largest values of a Series indexed by row
+    position, largest first, found without sorting the rest. Ties keep the
+    earlier row first.
+    """
+    return values.nlargest(top_n).index.to_numpy()
+
+def top_hotness_positions(hotness, top_n):
+    """
+    Positions of the top_n rows by hotness, leaving out rows scoring 0.
+    """
+    import pandas as pd
+
+    hotness = pd.Series(hotness)
+    return top_positions(hotness[hotness > 0], top_n)
+
+def get_top_trending_by_hotness(df, keywords, top_n=3, matches=None):
+    """
+    Gets our top 3 trending articles by 'hotness'. `matches` can reuse a
+    KeywordMatcher.match of the same keywords instead of scanning again.
+    """
+    from keyword_matcher import keyword_matcher
 
-    # Sort by hotness
-    return df[df["hotness"] > 0].sort_values(by="hotness", ascending=False).head(top_n)
+    if matches is None:
+        matches = keyword_matcher({"keywords": keywords}).match(df)
+
+    recency_score, keyword_score, hotness = hotness_scores(df, matches)
+    top = top_hotness_positions(hotness, top_n)
+    return df.iloc[top].assign(recency_score=recency_score[top], keyword_score=keyword_score[top], hotness=hotness[top])
 
 def get_top_trending(df, top_n=3):
     """
     Gets our top 3 trending articles from Reuters.
     """
-    return df.sort_values(by="timestamp", ascending=False).head(top_n)
+    return df.iloc[top_positions(df["timestamp"].reset_index(drop=True), top_n)]
 
 def save_digest(text, out_path="daily_digest.txt"):
     """
@@ -88,134 +374,291 @@ def save_digest(text, out_path="daily_digest.txt"):
     logging.info(f"\n Digest saved to {Path(out_path).resolve()}")
     print(f"Digest saved to {Path(out_path).resolve()}")
 
-def generate_digest_html(df, topics):
+def format_articles(df, positions):
+    """
+    Display fields of the articles at `positions`, computed column-wise once:
+    time strings, escaped absolute URLs, escaped titles and summary paragraphs.
+    """
+    import numpy as np
+
+    rows = df.iloc[positions]
+
+    timestamps = rows["timestamp"]
+    times = np.array(time_strings(), dtype=object)[(timestamps.dt.hour * 60 + timestamps.dt.minute).to_numpy()]
+
+    urls = rows["url"].astype(object).str.strip()
+    urls = urls.where(~urls.str.startswith("/", na=False), "https://www.reuters.com" + urls)
+    urls = urls.map(escape, na_action="ignore")
+
+    titles = rows["title"].astype(object).str.strip().map(escape, na_action="ignore")
+
+    summaries = rows["summary"].astype(object).fillna("").str.strip().map(escape)
+    summaries = summaries.map(lambda summary: SUMMARY_TEMPLATE.format(summary=summary) if summary else "")
+
+    return times.tolist(), urls.tolist(), titles.tolist(), summaries.tolist()
+
+def iter_articles_html(fields, indices, chunk_size=1000):
     """
-    Generates HTML digest of each topic.
+    Yields the list items of the articles at `indices` into the
+    format_articles fields, rendering a chunk of rows at a time.
     """
-    from html import escape
-    today = datetime.now().strftime("%B %d, %Y")
+    times, urls, titles, summaries = fields
 
-    # Combine all keywords for scoring
-    all_keywords = [kw for topic_kw in topics.values() for kw in topic_kw]
+    for start in range(0, len(indices), chunk_size):
+        yield "".join(
+            "\n" + ARTICLE_TEMPLATE.format(time=times[i], url=urls[i], title=titles[i], summary=summaries[i])
+            for i in indices[start:start + chunk_size].tolist()
+        )
+
+def frame_sections(df, topics, keyword_matches=None, top_n=3):
+    """
+    digest_sections of a DataFrame, whose articles are row positions, with
+    section_urls(positions) and render_articles(stale) for iter_sections_html.
+    """
+    import numpy as np
+
+    from keyword_matcher import keyword_matcher
+
+    # Match all topic keywords in one pass, for the topics and for scoring
+    if keyword_matches is None:
+        keyword_matches = keyword_matcher(topics).match(df)
+
+    sections = digest_sections(
+        topics,
+        top_n,
+        top_positions(df["timestamp"].reset_index(drop=True), top_n),
+        top_hotness_positions(hotness_scores(df, keyword_matches)[2], top_n),
+        topic_sections(df, topics, keyword_matches)
+    )
+
+    urls = []
+
+    def section_urls(positions):
+        if not urls:
+            urls.append(df["url"].astype(object).fillna("").to_numpy())
+        return urls[0][positions].tolist()
+
+    def render_articles(stale):
+        # Each article is formatted once, however many sections list it
+        rendered = np.unique(np.concatenate(stale).astype("int64")) if stale else np.array([], dtype="int64")
+        fields = format_articles(df, rendered)
+        return [iter_articles_html(fields, np.searchsorted(rendered, positions)) for positions in stale]
+
+    return sections, section_urls, render_articles
+
+def iter_digest_html(df, topics, keyword_matches=None, top_n=3, render_cache=None, title=None):
+    """
+    Yields the HTML digest of each topic piece by piece, starting with the
+    page head before any article is scored. With a render_cache directory,
+    sections whose fingerprint is unchanged since the last run are copied
+    from the cache instead of being rendered again. `df` can also be the
+    StreamedDigest of the pure-Python engine, which builds its own sections.
+    """
+    if title is None:
+        title = f"Daily News Digest — {datetime.now().strftime('%B %d, %Y')}"
 
     with open("digest.css", "r", encoding="utf-8") as css_file:
         css_styles = css_file.read()
 
-    html_lines = [
-        "<html>",
-        "<head>",
-        "<meta charset='UTF-8'>",
-        f"<title>Daily News Digest — {today}</title>",
-        "<style>",
-        css_styles,
-        "</style>",
-        "</head>",
-        "<body>",
-        f"<h1>📊 Daily News Digest — {today}</h1>"
-    ]
+    yield DIGEST_HEAD_TEMPLATE.format(title=escape(title), css=css_styles)
 
-    # Top 3 trending articles
-    top_trending = get_top_trending(df, 3)
-    if not top_trending.empty:
-        html_lines.append("<h2>🔥 Top 3 Trending Articles</h2>")
-        html_lines.append("<ul>")
-        for _, row in top_trending.iterrows():
-            time_str = row["timestamp"].strftime("%I:%M %p").lstrip("0")
-            title = escape(row["title"].strip())
-            summary = escape(str(row["summary"]).strip()) if pd.notna(row["summary"]) else ""
-            url = row["url"].strip()
-            full_url = f"https://www.reuters.com{url}" if url.startswith("/") else url
-            full_url = escape(full_url)
-
-            html_lines.append(
-                f"<li>"
-                f"<p class='time'>[{time_str}]</p> "
-                f"<a href='{full_url}' target='_blank' rel='noopener noreferrer'>{title}</a>"
-            )
-            if summary:
-                html_lines.append(f"<p class='summary'>{summary}</p>")
-            html_lines.append("</li>")
-        html_lines.append("</ul>")
-
-
-
-    # Top 3 Trending Articles by hotness
-    top_trending = get_top_trending_by_hotness(df, all_keywords, top_n=3)
-    if not top_trending.empty:
-        html_lines.append("<h2>🔥 Top 3 Trending Articles (By Hotness Score)</h2>")
-        html_lines.append("<ul>")
-
-        for _, row in top_trending.iterrows():
-            time_str = row["timestamp"].strftime("%I:%M %p").lstrip("0")
-            title = escape(row["title"].strip())
-            summary = escape(str(row["summary"]).strip()) if pd.notna(row["summary"]) else ""
-            url = row["url"].strip()
-            full_url = f"https://www.reuters.com{url}" if url.startswith("/") else url
-            full_url = escape(full_url)
-
-            html_lines.append(
-                f"<li>"
-                f"<p class='time'>[{time_str}]</p> "
-                f"<a href='{full_url}' target='_blank' rel='noopener noreferrer'>{title}</a>"
-            )
-            if summary:
-                html_lines.append(f"<p class='summary'>{summary}</p>")
-            html_lines.append("</li>")
-        html_lines.append("</ul>")
-
-    # Topic-wise articles
-    for topic, keywords in topics.items():
-        matches = filter_by_keywords(df, keywords)
-        if matches.empty:
-            continue
+    if hasattr(df, "sections"):
+        sections = df.sections(topics, top_n)
+    else:
+        sections = frame_sections(df, topics, keyword_matches, top_n)
+    yield from iter_sections_html(*sections, render_cache)
 
-        article_count = len(matches)
-        topic_title = f"{escape(topic.title())} ({article_count} article{'s' if article_count != 1 else ''})"
+    yield "\n</body></html>"
 
-        html_lines.append("<details>")
-        html_lines.append(f"<summary>{topic_title}</summary>")
-        html_lines.append("<ul style='margin-top: 10px;'>")
+def generate_digest_html(df, topics, keyword_matches=None, top_n=3, render_cache=None, title=None):
+    """
+    Generates HTML digest of each topic. `keyword_matches` can supply the
+    keyword_matcher(topics) matches of df, e.g. from the keyword index.
+    """
+    return "".join(iter_digest_html(df, topics, keyword_matches, top_n, render_cache, title))
 
-        for _, row in matches.iterrows():
-            time_str = row["timestamp"].strftime("%I:%M %p").lstrip("0")
-            title = escape(row["title"].strip())
-            summary = escape(str(row["summary"]).strip()) if pd.notna(row["summary"]) else ""
-            url = row["url"].strip()
-            full_url = f"https://www.reuters.com{url}" if url.startswith("/") else url
-            full_url = escape(full_url)
+def write_digest_html(df, topics, out_path="daily_digest.html", keyword_matches=None, top_n=3, render_cache=None,
+                      title=None, signature=None):
+    """
+    Streams the HTML digest into out_path as it is rendered. The page is
+    written to a temporary file first, so readers never see half a digest.
+    The stamp of the page it replaces is removed, and a new one is saved
+    when the digest_signature of its inputs is given.
+    """
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for piece in iter_digest_html(df, topics, keyword_matches, top_n, render_cache, title):
+            f.write(piece)
+    try:
+        os.remove(out_path + ".stamp")
+    except FileNotFoundError:
+        pass
+    os.replace(tmp_path, out_path)
+    if signature:
+        with open(out_path + ".stamp", "w", encoding="utf-8") as f:
+            f.write(digest_stamp(out_path, signature))
+    logging.info(f"\n Digest saved to {Path(out_path).resolve()}")
+    print(f"Digest saved to {Path(out_path).resolve()}")
 
-            html_lines.append(
-                f"<li>"
-                f"<p class='time'>[{time_str}]</p> "
-                f"<a href='{full_url}' target='_blank' rel='noopener noreferrer'>{title}</a>"
-            )
-            if summary:
-                html_lines.append(f"<p class='summary'>{summary}</p>")
-            html_lines.append("</li>")
+def window_mode(value):
+    """
+    Validate a --window value: day, week, all, or a number of hours like 24h.
+    """
+    if value in ("day", "week", "all") or (value.endswith("h") and value[:-1].isdigit() and int(value[:-1]) > 0):
+        return value
+    raise ValueError(f"invalid window {value!r}")
 
-        html_lines.append("</ul>")
-        html_lines.append("</details>")
+def digest_window(window="day", now=None):
+    """
+    (since, title) of a digest window: the calendar day or week so far in local
+    time, a rolling number of hours ("24h"), or all stored articles ("all").
+    """
+    now = now or datetime.now().astimezone()
+    today = now.strftime("%B %d, %Y")
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if window == "day":
+        return midnight, f"Daily News Digest — {today}"
+    if window == "week":
+        monday = midnight - timedelta(days=now.weekday())
+        return monday, f"Weekly News Digest — Week of {monday.strftime('%B %d, %Y')}"
+    if window == "all":
+        return None, f"News Digest — {today}"
+    hours = int(window_mode(window)[:-1])
+    return now - timedelta(hours=hours), f"News Digest — Last {hours} Hours, {today}"
+
+def store_files(store):
+    """
+    The files a digest of `store` is read from: the CSV (or SQLite database
+    and its write-ahead log), or every file of a Parquet archive.
+    """
+    if os.path.isdir(store):
+        return sorted(entry.path for entry in os.scandir(store) if entry.is_file())
+    paths = [store, store + "-wal"]
+    if is_archive_path(store):
+        paths.append(archive_fallback_csv(store))
+    return paths
+
+def digest_signature(store, title, top_n):
+    """
+    Fingerprint of everything a digest with a fixed window is rendered from:
+    the size and modification time of the store's files, topics.json and
+    digest.css, plus the page title and top_n. Computed without reading any
+    article, so an up-to-date digest is detected before pandas is imported.
+    """
+    digest = hashlib.sha256(f"{RENDER_CACHE_VERSION}\0{title}\0{top_n}".encode("utf-8"))
+    for path in store_files(store) + ["topics.json", "digest.css"]:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        digest.update(f"\0{path}\0{stat.st_size}\0{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()
 
-    html_lines.append("</body></html>")
+def digest_stamp(out_path, signature):
+    """
+    The stamp of a digest rendered from inputs with this digest_signature:
+    the signature plus out_path's size and modification time, so a page
+    overwritten by another run (a rolling window, the service) no longer
+    matches. None if out_path doesn't exist.
+    """
+    try:
+        stat = os.stat(out_path)
+    except FileNotFoundError:
+        return None
+    return f"{signature}\0{stat.st_size}\0{stat.st_mtime_ns}"
 
-    return "\n".join(html_lines)
+def read_digest_stamp(out_path):
+    """
+    The digest_stamp saved with out_path by the last run, if any.
+    """
+    try:
+        with open(out_path + ".stamp", "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
 
-def main():
+def main(argv=None):
     """
     Main function to run the analyzer.
     """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate the Reuters news digest")
+    parser.add_argument("--store", default="reuters_articles.csv",
+                        help="Article CSV file, SQLite database (.db/.sqlite) or Parquet archive (.parquet)")
+    parser.add_argument("--window", type=window_mode, default="day",
+                        help="Articles to include: day (since local midnight, the default), week (since "
+                             "Monday), a rolling number of hours like 24h, or all")
+    parser.add_argument("--today", action="store_true",
+                        help="Same as --window day")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only parse CSV rows appended since the last incremental run")
+    parser.add_argument("--top-n", type=int, default=3,
+                        help="Number of articles in the top trending sections (default: 3)")
+    parser.add_argument("--render-cache", default="digest_cache", metavar="DIR",
+                        help="Reuse sections rendered by earlier runs from DIR (default: digest_cache)")
+    parser.add_argument("--no-render-cache", action="store_true",
+                        help="Render every section from scratch")
+    parser.add_argument("--keyword-index", action="store_true",
+                        help="Answer topic and hotness matches from the keyword index next to the store")
+    parser.add_argument("--engine", choices=("pandas", "python"), default="pandas",
+                        help="pandas (default), or python: stream the store with the csv module and keep only the "
+                             "articles the digest lists, for low-memory hosts")
+    parser.add_argument("--force", action="store_true",
+                        help="Render the digest even if its articles and settings haven't changed")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Run the digest in a fresh interpreter and report its run time and slowest imports")
+    args = parser.parse_args(argv)
+
+    if args.engine == "python" and (args.incremental or args.keyword_index):
+        parser.error("--incremental and --keyword-index need the pandas engine")
+
+    if args.profile_startup:
+        import sys
+
+        from startup_profile import profile_startup
+
+        return profile_startup(__file__, sys.argv[1:] if argv is None else argv)
+
     logging.info("Started digest")
 
-    df = load_articles()
+    out_path = "daily_digest.html"
+    window = "day" if args.today else args.window
+    since, title = digest_window(window)
+
+    # A rolling window moves on its own, so only fixed windows can be up to date
+    signature = None if window.endswith("h") else digest_signature(args.store, title, args.top_n)
+    stamp = digest_stamp(out_path, signature) if signature else None
+    if stamp and not args.force and read_digest_stamp(out_path) == stamp:
+        logging.info("Digest is up to date")
+        print("Digest is up to date.")
+        return
+
     topics = load_topics()
+    if args.engine == "python":
+        from streaming_digest import stream_articles
+
+        df = stream_articles(args.store, topics, args.top_n, since=since)
+    else:
+        df = load_articles(args.store, since=since, incremental=args.incremental)
 
     if df.empty or not topics:
         logging.warning("No articles or topics to process.")
         print("No articles or topics to process.")
         exit()
 
-    digest_html = generate_digest_html(df, topics)
-    save_digest(digest_html, out_path="daily_digest.html")
+    keyword_matches = None
+    if args.keyword_index:
+        from keyword_index import load_keyword_matches
+        from keyword_matcher import keyword_matcher
+
+        keyword_matches = load_keyword_matches(args.store, df, keyword_matcher(topics),
+                                               lambda: load_articles(args.store))
+
+    write_digest_html(df, topics, out_path, keyword_matches, top_n=args.top_n,
+                      render_cache=None if args.no_render_cache else args.render_cache, title=title,
+                      signature=signature)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
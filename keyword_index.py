@@ -0,0 +1,176 @@
+import os
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+
+from article_store import keyword_index_path
+from keyword_matcher import MATCHER_VERSION, KeywordMatcher, KeywordMatches
+
+KEYWORD_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS keywords (
+    id INTEGER PRIMARY KEY,
+    keyword TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS postings (
+    article_id INTEGER NOT NULL,
+    keyword_id INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (article_id, keyword_id)
+) WITHOUT ROWID;
+"""
+
+
+def connect_keyword_index(path):
+    """
+    Open (and create if needed) a keyword index database.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(KEYWORD_INDEX_SCHEMA)
+
+    # Postings matched under older matching rules are dropped and rebuilt
+    if conn.execute("PRAGMA user_version").fetchone()[0] != MATCHER_VERSION:
+        conn.executescript("DELETE FROM postings; DELETE FROM keywords; DELETE FROM articles;")
+        conn.execute(f"PRAGMA user_version = {MATCHER_VERSION}")
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS lookup (position INTEGER PRIMARY KEY, url TEXT NOT NULL)")
+    return conn
+
+
+def lookup_urls(conn, urls):
+    """
+    Fill the temporary lookup table with `urls` and return their article ids
+    in order, -1 for articles that aren't indexed yet.
+    """
+    conn.execute("DELETE FROM lookup")
+    conn.executemany("INSERT INTO lookup (position, url) VALUES (?, ?)", enumerate(urls))
+
+    ids = np.full(len(urls), -1, dtype="int64")
+    found = conn.execute("SELECT l.position, a.id FROM lookup l JOIN articles a ON a.url = l.url").fetchall()
+    if found:
+        positions, article_ids = np.array(found, dtype="int64").T
+        ids[positions] = article_ids
+    return ids
+
+
+def keyword_ids(conn, keywords):
+    """
+    Index ids of `keywords`, adding the ones the index doesn't know yet.
+    """
+    conn.executemany("INSERT OR IGNORE INTO keywords (keyword) VALUES (?)", ((k,) for k in keywords))
+    ids = dict(conn.execute("SELECT keyword, id FROM keywords"))
+    return np.array([ids[k] for k in keywords], dtype="int64")
+
+
+def insert_postings(conn, matches, article_ids):
+    """
+    Store the per-keyword counts of `matches`, whose rows have the given article ids.
+    """
+    if not len(matches.rows):
+        return
+
+    keywords = matches.matcher.keywords
+    pairs, counts = np.unique(matches.rows * len(keywords) + matches.keyword_ids, return_counts=True)
+    rows, ids = np.divmod(pairs, len(keywords))
+    conn.executemany(
+        "INSERT OR REPLACE INTO postings (article_id, keyword_id, count) VALUES (?, ?, ?)",
+        zip(article_ids[rows].tolist(), keyword_ids(conn, keywords)[ids].tolist(), counts.tolist())
+    )
+
+
+def index_articles(conn, df, keywords):
+    """
+    Add the articles of `df` to the index, matched against every keyword.
+    """
+    if df.empty:
+        return
+
+    urls = df["url"].tolist()
+    conn.executemany("INSERT OR IGNORE INTO articles (url) VALUES (?)", ((url,) for url in urls))
+    if keywords:
+        matches = KeywordMatcher({"index": keywords}).match(df)
+        insert_postings(conn, matches, lookup_urls(conn, urls))
+
+
+def sync_keyword_index(conn, keywords, load_store):
+    """
+    Bring the indexed keywords in line with `keywords`. Postings of removed
+    keywords are dropped. Added keywords are matched against the whole store,
+    loaded with load_store(), without re-matching the keywords already
+    indexed. Returns the added keywords.
+    """
+    known = dict(conn.execute("SELECT keyword, id FROM keywords"))
+    removed = [(known[k],) for k in known if k not in keywords]
+    if removed:
+        conn.executemany("DELETE FROM postings WHERE keyword_id = ?", removed)
+        conn.executemany("DELETE FROM keywords WHERE id = ?", removed)
+
+    added = [k for k in keywords if k not in known]
+    if added:
+        df = load_store()
+        article_ids = lookup_urls(conn, df["url"].tolist())
+        indexed = article_ids >= 0
+
+        matches = KeywordMatcher({"added": added}).match(df[indexed])
+        insert_postings(conn, matches, article_ids[indexed])
+        keyword_ids(conn, added)
+        index_articles(conn, df[~indexed], keywords)
+
+    conn.commit()
+    return added
+
+
+def load_keyword_matches(store, df, matcher, load_store):
+    """
+    KeywordMatches of `matcher` for the rows of `df`, answered from the
+    postings of the index next to `store`. Rows the index doesn't cover yet
+    are matched and added to it first.
+    """
+    with closing(connect_keyword_index(keyword_index_path(store))) as conn:
+        sync_keyword_index(conn, matcher.keywords, load_store)
+
+        urls = df["url"].tolist()
+        missing = lookup_urls(conn, urls) < 0
+        if missing.any():
+            index_articles(conn, df[missing], matcher.keywords)
+            lookup_urls(conn, urls)
+        conn.commit()
+
+        index_ids = keyword_ids(conn, matcher.keywords)
+        postings = conn.execute(
+            "SELECT l.position, p.keyword_id, p.count FROM lookup l "
+            "JOIN articles a ON a.url = l.url JOIN postings p ON p.article_id = a.id"
+        ).fetchall()
+
+    if not postings:
+        empty = np.array([], dtype="int64")
+        return KeywordMatches(matcher, df.index, empty, empty)
+
+    # After the sync every indexed keyword is one of the matcher's
+    matcher_ids = np.zeros(index_ids.max() + 1, dtype="int64")
+    matcher_ids[index_ids] = np.arange(len(index_ids))
+    positions, posting_keywords, counts = np.array(postings, dtype="int64").T
+    return KeywordMatches(matcher, df.index, np.repeat(positions, counts),
+                          np.repeat(matcher_ids[posting_keywords], counts))
+
+
+def index_new_articles(store, articles):
+    """
+    Add newly stored articles to the keyword index of `store`, if it has one.
+    Returns the number of articles indexed.
+    """
+    path = keyword_index_path(store)
+    if not articles or not os.path.exists(path):
+        return 0
+
+    import pandas as pd
+
+    with closing(connect_keyword_index(path)) as conn:
+        keywords = [k for (k,) in conn.execute("SELECT keyword FROM keywords ORDER BY id")]
+        index_articles(conn, pd.DataFrame(articles, columns=["title", "url", "summary"]), keywords)
+        conn.commit()
+    return len(articles)
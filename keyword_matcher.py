@@ -0,0 +1,267 @@
+from functools import lru_cache
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+MATCHER_BACKENDS = ("auto", "ahocorasick", "find")
+
+# Bumped whenever the matching rules change, so stored matches get rebuilt
+MATCHER_VERSION = 2
+
+ASCII_WORD_CHARACTERS = np.array([chr(i).isalnum() or chr(i) == "_" for i in range(128)])
+
+
+def has_pyahocorasick():
+    """
+    True if pyahocorasick can be imported.
+    """
+    try:
+        import ahocorasick  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_matcher_backend(backend="auto"):
+    """
+    Map "auto" to the Aho-Corasick automaton when pyahocorasick is installed,
+    otherwise to one str.find scan per keyword.
+    """
+    if backend not in MATCHER_BACKENDS:
+        raise ValueError(f"Unknown matcher backend {backend!r}, expected one of {MATCHER_BACKENDS}")
+    if backend == "auto":
+        return "ahocorasick" if has_pyahocorasick() else "find"
+    return backend
+
+
+def word_characters(codes):
+    """
+    Which of the given code points re's \\w matches: alphanumerics and "_".
+    """
+    is_word = ASCII_WORD_CHARACTERS[np.minimum(codes, 127)]
+    wide = codes > 127
+    if wide.any():
+        values, inverse = np.unique(codes[wide], return_inverse=True)
+        is_word[wide] = np.array([chr(value).isalnum() for value in values.tolist()])[inverse]
+    return is_word
+
+
+def self_overlapping(keyword):
+    """
+    True if two occurrences of `keyword` can overlap, as in "aa" or "abab".
+    """
+    return any(keyword.startswith(keyword[i:]) for i in range(1, len(keyword)))
+
+
+class KeywordMatches:
+    """
+    Keyword occurrences in the title and summary of each row of a DataFrame,
+    stored as one (row, keyword id) pair per counted match.
+    """
+
+    def __init__(self, matcher, index, rows, keyword_ids):
+        self.matcher = matcher
+        self.index = index
+        self.rows = rows
+        self.keyword_ids = keyword_ids
+
+    def counts(self):
+        """
+        Per-keyword match counts, one column per distinct lowercased keyword.
+        """
+        counts = np.zeros((len(self.index), len(self.matcher.keywords)), dtype="int64")
+        np.add.at(counts, (self.rows, self.keyword_ids), 1)
+        return pd.DataFrame(counts, index=self.index, columns=self.matcher.keywords)
+
+    def topic_mask(self, topic):
+        """
+        Boolean array of the rows matching any keyword of `topic`.
+        """
+        hits = np.isin(self.keyword_ids, self.matcher.topic_ids[topic])
+        mask = np.zeros(len(self.index), dtype=bool)
+        mask[self.rows[hits]] = True
+        return mask
+
+    def topic_bitmask(self):
+        """
+        Topic membership of every row as a bitmask: an (n, words) uint64 array
+        whose bit i (bit i % 64 of word i // 64) is set when the row matches
+        the matcher's i-th topic.
+        """
+        topic_bits = self.matcher.topic_bits
+        bitmask = np.zeros((len(self.index), topic_bits.shape[1]), dtype="uint64")
+        for word in range(topic_bits.shape[1]):
+            np.bitwise_or.at(bitmask[:, word], self.rows, topic_bits[self.keyword_ids, word])
+        return bitmask
+
+    def scores(self):
+        """
+        keyword_match_score of title plus summary for every row, with each
+        keyword weighted by how often it appears across the matcher's topics.
+        """
+        weights = self.matcher.weights[self.keyword_ids]
+        scores = np.bincount(self.rows, weights=weights, minlength=len(self.index))
+        return pd.Series(scores.astype("int64"), index=self.index)
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive, whole-word matcher for the keywords of every topic at once.
+
+    match() scans each title and summary a single time with an Aho-Corasick
+    automaton (pyahocorasick) and returns both the topic hits and the
+    per-keyword counts. Without pyahocorasick each keyword is found with
+    str.split instead. Keywords are plain text, and a match must not be
+    preceded or followed by a word character, so "AI" doesn't match "said".
+    Occurrences of the same keyword never overlap.
+    """
+
+    def __init__(self, topics, backend="auto"):
+        self.backend = resolve_matcher_backend(backend)
+        self.keywords = []
+        self.topic_ids = {}
+        ids = {}
+        weights = []
+
+        for topic, keywords in topics.items():
+            topic_ids = set()
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if not keyword:
+                    continue
+                if keyword not in ids:
+                    ids[keyword] = len(self.keywords)
+                    self.keywords.append(keyword)
+                    weights.append(0)
+                weights[ids[keyword]] += 1
+                topic_ids.add(ids[keyword])
+            self.topic_ids[topic] = np.array(sorted(topic_ids), dtype="int64")
+
+        self.weights = np.array(weights, dtype="int64")
+
+        # Bit i of a keyword's row is set when it belongs to the i-th topic
+        self.topic_bits = np.zeros((len(self.keywords), max(1, -(-len(self.topic_ids) // 64))), dtype="uint64")
+        for i, ids in enumerate(self.topic_ids.values()):
+            self.topic_bits[ids, i // 64] |= np.uint64(1 << (i % 64))
+        self.lengths = np.array([len(keyword) for keyword in self.keywords], dtype="int64")
+        self.overlapping = [i for i, keyword in enumerate(self.keywords) if self_overlapping(keyword)]
+
+        self.automaton = None
+        if self.backend == "ahocorasick" and self.keywords:
+            import ahocorasick
+
+            self.automaton = ahocorasick.Automaton()
+            for i, keyword in enumerate(self.keywords):
+                self.automaton.add_word(keyword, i)
+            self.automaton.make_automaton()
+
+    def find_all(self, corpus):
+        """
+        End offsets and keyword ids of every occurrence in `corpus`,
+        overlapping ones included.
+        """
+        if self.automaton is not None:
+            flat = np.fromiter(chain.from_iterable(self.automaton.iter(corpus)), dtype="int64")
+            return flat[0::2], flat[1::2]
+
+        ends = []
+        keyword_ids = []
+        for i, keyword in enumerate(self.keywords):
+            if i in self.overlapping:
+                found = []
+                position = corpus.find(keyword)
+                while position != -1:
+                    found.append(position + len(keyword) - 1)
+                    position = corpus.find(keyword, position + 1)
+                found = np.array(found, dtype="int64")
+            else:
+                # Occurrences can't overlap, so the pieces between them give their offsets
+                pieces = corpus.split(keyword)
+                lengths = np.fromiter(map(len, pieces[:-1]), dtype="int64", count=len(pieces) - 1)
+                found = np.cumsum(lengths + len(keyword)) - 1
+            ends.append(found)
+            keyword_ids.append(np.full(len(found), i, dtype="int64"))
+        if not ends:
+            return np.array([], dtype="int64"), np.array([], dtype="int64")
+        return np.concatenate(ends), np.concatenate(keyword_ids)
+
+    def match_texts(self, texts):
+        """
+        (text numbers, keyword ids) of the counted matches in a list of
+        lowercased strings.
+        """
+        lengths = np.fromiter(map(len, texts), dtype="int64", count=len(texts))
+        offsets = np.concatenate(([0], np.cumsum(lengths + 1)[:-1]))
+        corpus = "\n".join(texts)
+        ends, keyword_ids = self.find_all(corpus)
+        if not len(ends):
+            return ends, keyword_ids
+
+        # Drop matches spanning the separator between two texts
+        starts = ends - self.lengths[keyword_ids] + 1
+        texts_hit = np.searchsorted(offsets, starts, side="right") - 1
+        keep = texts_hit == np.searchsorted(offsets, ends, side="right") - 1
+
+        # Whole words only, like (?<!\w)keyword(?!\w): the newline separators
+        # padding the corpus stand in for the start and end of the text
+        codes = np.frombuffer(("\n" + corpus + "\n").encode("utf-32-le"), dtype="uint32")
+        keep &= ~word_characters(codes[starts]) & ~word_characters(codes[ends + 2])
+
+        # Like str.count, skip occurrences overlapping an earlier counted one
+        for i in self.overlapping:
+            last_end = -1
+            for j in np.flatnonzero(keep & (keyword_ids == i)):
+                if starts[j] <= last_end:
+                    keep[j] = False
+                else:
+                    last_end = ends[j]
+
+        return texts_hit[keep], keyword_ids[keep]
+
+    def count(self, text):
+        """
+        Weighted number of keyword matches in one string.
+        """
+        _, keyword_ids = self.match_texts([text.lower()])
+        return int(self.weights[keyword_ids].sum())
+
+    def match(self, df, chunk_size=20000):
+        """
+        Match the title and summary of every row of `df`. Missing values count
+        as empty text.
+        """
+        titles = df["title"].astype(object).fillna("").tolist()
+        summaries = df["summary"].astype(object).fillna("").tolist()
+        rows = []
+        keyword_ids = []
+
+        for start in range(0, len(df), chunk_size):
+            chunk_titles = titles[start:start + chunk_size]
+            texts = [None] * (2 * len(chunk_titles))
+            texts[0::2] = [title.lower() for title in chunk_titles]
+            texts[1::2] = [summary.lower() for summary in summaries[start:start + chunk_size]]
+
+            texts_hit, ids = self.match_texts(texts)
+            rows.append(texts_hit // 2 + start)
+            keyword_ids.append(ids)
+
+        return KeywordMatches(
+            self,
+            df.index,
+            np.concatenate(rows) if rows else np.array([], dtype="int64"),
+            np.concatenate(keyword_ids) if keyword_ids else np.array([], dtype="int64")
+        )
+
+
+@lru_cache(maxsize=32)
+def cached_keyword_matcher(topic_keywords):
+    return KeywordMatcher({topic: list(keywords) for topic, keywords in topic_keywords})
+
+
+def keyword_matcher(topics):
+    """
+    KeywordMatcher for a {topic: keywords} dict, built once per process for
+    each distinct set of topic keywords.
+    """
+    return cached_keyword_matcher(tuple((topic, tuple(keywords)) for topic, keywords in topics.items()))
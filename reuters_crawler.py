@@ -1,16 +1,41 @@
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime
-import csv
+from functools import lru_cache
+import hashlib
+import json
 import os
 import logging
+import re
+import sys
+from urllib.parse import urljoin
+
+from article_store import keyword_index_path, save_articles
+
+LOG_FILE = "logs/crawler.log"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+
+def log_file():
+    """
+    The file the root logger writes to: LOG_FILE, unless the program running
+    the crawler (like the digest service) configured logging itself.
+    """
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.FileHandler):
+            return os.path.relpath(handler.baseFilename)
+    return LOG_FILE
+
+def truncate_large_log():
+    """
+    Empty the log file once it grows past LOG_MAX_BYTES.
+    """
+    path = log_file()
+    if os.path.exists(path) and os.path.getsize(path) > LOG_MAX_BYTES:
+        open(path, "w").close()
 
 os.makedirs("logs", exist_ok=True)
-if os.path.exists("logs/crawler.log") and os.path.getsize("logs/crawler.log") > 5 * 1024 * 1024:
-    open("logs/crawler.log", "w").close()
+truncate_large_log()
 
 logging.basicConfig(
-    filename="logs/crawler.log",
+    filename=LOG_FILE,
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(message)s"
 )
@@ -40,26 +65,119 @@ def safe_parse_iso8601(dt_string):
 
     return datetime.fromisoformat(dt_string.replace("Z", "+00:00"))
 
-def fetch_html(url):
+BASE_URL = "https://www.reuters.com"
+
+REQUEST_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/114.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Connection": "keep-alive"
+}
+
+HTTP_CACHE_FILE = "http_cache.json"
+
+PARSER_BACKENDS = ("auto", "lxml", "strainer", "bs4")
+
+# Returned by fetch_html when the server answers 304 Not Modified
+NOT_MODIFIED = object()
+
+_session = None
+
+# Story-card region fingerprinting, see story_card_fingerprint()
+STORY_CARD_RE = re.compile(r"""<li\b[^>]*\bclass\s*=\s*["']?[^"'>]*story-card""", re.I)
+LI_TAG_RE = re.compile(r"<(/?)li\b", re.I)
+VOLATILE_MARKUP_RE = re.compile(
+    r"<!--.*?-->|<script\b.*?</script>|<style\b.*?</style>"
+    r"""|\s(?:id|nonce|style|data-(?!testid)[\w-]+)\s*=\s*(?:"[^"]*"|'[^']*'|[^\s>]+)""",
+    re.I | re.S
+)
+TIME_TEXT_RE = re.compile(r"(<time\b[^>]*>).*?(</time>)", re.I | re.S)
+WHITESPACE_RE = re.compile(r"\s+")
+
+def create_session(pool_size=10):
+    """
+    Create a keep-alive HTTP session whose connection pool can serve pool_size
+    concurrent requests.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.headers.update(REQUEST_HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_session(pool_size=10):
+    """
+    Return the process-wide keep-alive session, creating it on first use.
+    """
+    global _session
+    if _session is None:
+        _session = create_session(pool_size)
+    return _session
+
+def load_http_cache(filepath=HTTP_CACHE_FILE):
+    """
+    Load the per-URL ETag/Last-Modified validators saved by earlier runs.
+    """
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_http_cache(cache, filepath=HTTP_CACHE_FILE):
+    """
+    Persist the validators. Only call this once the fetched pages have been stored,
+    otherwise a failed run would be answered with 304 next time and lose articles.
+    """
+    tmp_path = filepath + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, filepath)
+
+def fetch_html(url, session=None, cache=None, pending=None):
     """
     Send a GET request to the provided URL and return the HTML content.
+    With a validator cache the request is conditional, and NOT_MODIFIED is
+    returned when the page hasn't changed since it was cached, either because
+    the server says so or because its story cards hash the same as last time.
+    The page's new validators go into `pending` when given, to be copied into
+    the cache once its articles are stored, and straight into the cache otherwise.
     """
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/114.0.0.0 Safari/537.36"
-        ),
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Connection": "keep-alive"
-    }
+    import requests
+
+    session = session or get_session()
+    headers = {}
+    entry = cache.get(url, {}) if cache is not None else {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = session.get(url, headers=headers, timeout=10)
+        if response.status_code == 304:
+            return NOT_MODIFIED
         if response.status_code == 200:
-            return response.text
+            html_content = response.text
+            if cache is not None:
+                content_hash = story_card_fingerprint(html_content)
+                (cache if pending is None else pending)[url] = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "content_hash": content_hash
+                }
+                if content_hash is not None and content_hash == entry.get("content_hash"):
+                    return NOT_MODIFIED
+            return html_content
         else:
             print(f"Failed to fetch URL: {url} | Status code: {response.status_code}")
             return None
@@ -67,15 +185,82 @@ def fetch_html(url):
         print(f"Request error: {error}")
         return None
 
-def parse_articles(html):
+def story_card_region(html):
     """
-    Parse the HTML and extract article title, timestamp, and link.
+    Return the markup from the first story card to the end of the last one,
+    found with regular expressions so no DOM has to be built.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    articles = []
+    starts = [match.start() for match in STORY_CARD_RE.finditer(html)]
+    if not starts:
+        return None
 
-    # Match all story-card <li> elements (regardless of additional classes)
-    story_cards = soup.find_all("li", class_=lambda c: c and "story-card" in c)
+    end = len(html)
+    depth = 0
+    for match in LI_TAG_RE.finditer(html, starts[-1]):
+        depth += -1 if match.group(1) else 1
+        if depth == 0:
+            close = html.find(">", match.end())
+            end = close + 1 if close != -1 else len(html)
+            break
+
+    return html[starts[0]:end]
+
+def story_card_fingerprint(html):
+    """
+    Hash the story-card region after dropping markup that changes between
+    otherwise identical responses: comments, scripts, ids, nonces, inline styles,
+    data attributes other than data-testid, the display text of <time> tags and
+    whitespace. Returns None when the page has no story cards.
+    """
+    region = story_card_region(html)
+    if region is None:
+        return None
+
+    region = VOLATILE_MARKUP_RE.sub("", region)
+    region = TIME_TEXT_RE.sub(r"\1\2", region)
+    region = WHITESPACE_RE.sub(" ", region)
+    return hashlib.sha256(region.encode("utf-8")).hexdigest()
+
+def has_lxml():
+    """
+    True if lxml can be imported.
+    """
+    try:
+        import lxml.html  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def resolve_parser_backend(backend="auto"):
+    """
+    Pick the story-card parser: "auto" prefers lxml and falls back to
+    BeautifulSoup restricted to story cards ("strainer"). "bs4" builds the full tree.
+    """
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend}")
+    if backend == "auto":
+        return "lxml" if has_lxml() else "strainer"
+    return backend
+
+def is_story_card_class(css_class):
+    """
+    Match all story-card <li> elements (regardless of additional classes).
+    """
+    return css_class and "story-card" in css_class
+
+def extract_story_cards_bs4(html, restricted=False):
+    """
+    Return (title, href, datetime attribute, summary) for each story card, using BeautifulSoup.
+    When restricted, a SoupStrainer keeps only story-card <li> subtrees, so the
+    rest of the page is tokenized but never turned into Tag objects.
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    parse_only = SoupStrainer("li", class_=is_story_card_class) if restricted else None
+    soup = BeautifulSoup(html, "html.parser", parse_only=parse_only)
+    cards = []
+
+    story_cards = soup.find_all("li", class_=is_story_card_class)
 
     for tag in story_cards:
         title_tag = tag.find("span", attrs={"data-testid": "TitleHeading"})
@@ -86,14 +271,97 @@ def parse_articles(html):
         if not title_tag or not link_tag:
             continue
 
-        title = title_tag.get_text(strip=True)
-        relative_url = link_tag.get("href")
-        summary = summary_tag.get_text(strip=True) if summary_tag else ""
+        cards.append((
+            title_tag.get_text(strip=True),
+            link_tag.get("href"),
+            time_tag.get("datetime") if time_tag else None,
+            summary_tag.get_text(strip=True) if summary_tag else ""
+        ))
+
+    return cards
+
+@lru_cache(maxsize=None)
+def lxml_story_card_queries():
+    """
+    Compile the XPath queries used by extract_story_cards_lxml once per process.
+    """
+    from lxml import etree
+
+    return (
+        etree.XPath('//li[contains(@class, "story-card")]'),
+        etree.XPath('(.//span[@data-testid="TitleHeading"])[1]'),
+        etree.XPath('(.//a[@data-testid="TitleLink"])[1]'),
+        etree.XPath("(.//time)[1]"),
+        etree.XPath('(.//p[@data-testid="Description"])[1]'),
+        # Same strings BeautifulSoup's get_text() returns: no comments, scripts, styles or templates
+        etree.XPath(".//text()[not(ancestor::script) and not(ancestor::style) and not(ancestor::template)]")
+    )
+
+def extract_story_cards_lxml(html):
+    """
+    Return the same tuples as extract_story_cards_bs4, using lxml's C parser and
+    precompiled XPath queries instead of walking the tree in Python.
+    """
+    from lxml import html as lxml_html
+
+    find_cards, find_title, find_link, find_time, find_summary, find_text = lxml_story_card_queries()
+
+    def text_of(element):
+        return "".join(part.strip() for part in find_text(element) if part.strip())
+
+    cards = []
+    for tag in find_cards(lxml_html.fromstring(html)):
+        title_tag = find_title(tag)
+        link_tag = find_link(tag)
+        if not title_tag or not link_tag:
+            continue
+
+        time_tag = find_time(tag)
+        summary_tag = find_summary(tag)
+
+        cards.append((
+            text_of(title_tag[0]),
+            link_tag[0].get("href"),
+            time_tag[0].get("datetime") if time_tag else None,
+            text_of(summary_tag[0]) if summary_tag else ""
+        ))
+
+    return cards
+
+def extract_story_cards(html, backend="auto"):
+    """
+    Extract story cards with the chosen parser backend. Pages lxml refuses
+    (e.g. empty documents) are handed to BeautifulSoup instead.
+    """
+    backend = resolve_parser_backend(backend)
+
+    if backend == "lxml":
+        from lxml import etree
+
+        try:
+            return extract_story_cards_lxml(html)
+        except (ValueError, etree.ParserError) as e:
+            logging.warning(f"lxml could not parse page, falling back to BeautifulSoup: {e}")
+            backend = "strainer"
+
+    return extract_story_cards_bs4(html, restricted=backend == "strainer")
+
+def parse_articles(html, section=None, backend="auto"):
+    """
+    Parse the HTML and extract article title, timestamp, and link.
+    Each article is tagged with the section the page belongs to.
+    """
+    articles = []
+
+    for title, relative_url, datetime_attr, summary in extract_story_cards(html, backend):
+        if not relative_url:
+            logging.warning(f"Skipping story card without a link: {title!r}")
+            continue
         full_url = "https://www.reuters.com" + relative_url if relative_url.startswith("/") else relative_url
 
         try:
-            if time_tag and time_tag.get("datetime"):
-                timestamp = safe_parse_iso8601(time_tag["datetime"])
+            if datetime_attr:
+                timestamp = safe_parse_iso8601(datetime_attr)
             else:
                 timestamp = datetime.utcnow()
         except Exception as e:
@@ -104,66 +372,287 @@ def parse_articles(html):
             "title": title,
             "timestamp": timestamp,
             "url": full_url,
-            "summary": summary
+            "summary": summary,
+            "section": section
         })
 
     return articles
 
-def save_to_csv(articles, filename="reuters_articles.csv"):
+def read_sections_file(filepath="sections.json"):
     """
-    Append articles to a CSV file. Writes headers if missing or if file doesn't exist.
+    Read sections.json as is. Each section maps either to its page path or
+    to {"path": ..., "interval": seconds between daemon crawls}.
     """
-    fieldnames = ["timestamp", "formatted_time", "title", "url", "summary"]
-    write_headers = True
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"Section file '{filepath}' not found.")
+        return {}
 
-    if os.path.exists(filename):
-        with open(filename, mode="r", encoding="utf-8") as file:
-            first_line = file.readline().strip().lower()
-            expected = ",".join(fieldnames)
-            if expected in first_line:
-                write_headers = False
+def load_sections(filepath="sections.json"):
+    """
+    Load the section name -> page path mapping crawled with --sections.
+    """
+    return {
+        name: entry["path"] if isinstance(entry, dict) else entry
+        for name, entry in read_sections_file(filepath).items()
+    }
 
-    try:
-        with open(filename, mode="a", newline="", encoding="utf-8") as file:
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
+def load_section_intervals(filepath="sections.json"):
+    """
+    Load the section name -> crawl interval (seconds) of the sections that
+    set their own cadence in sections.json.
+    """
+    return {
+        name: float(entry["interval"])
+        for name, entry in read_sections_file(filepath).items()
+        if isinstance(entry, dict) and entry.get("interval")
+    }
+
+def save_snapshot(html, name, directory):
+    """
+    Save a fetched page under directory, e.g. for benchmarks/snapshots.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html)
+    return path
 
-            if write_headers:
-                writer.writeheader()
+def select_sections(names):
+    """
+    The sections.json entries named in `names` ({name: path}), or all of them
+    when `names` is empty. Unknown names are reported and skipped.
+    """
+    sections = load_sections()
+    for name in names:
+        if name not in sections:
+            print(f"Unknown section '{name}', skipping.")
+    if names:
+        sections = {name: path for name, path in sections.items() if name in names}
+    return sections
+
+def crawl_section(name, path, session, cache=None, backend="auto", snapshot_dir=None, pending=None):
+    """
+    Fetch and parse one section page. Returns None if the page couldn't be
+    fetched and NOT_MODIFIED if it hasn't changed.
+    """
+    html_content = fetch_html(urljoin(BASE_URL, path), session, cache, pending)
+    if html_content is None or html_content is NOT_MODIFIED:
+        return html_content
+    if snapshot_dir:
+        save_snapshot(html_content, name, snapshot_dir)
+    return parse_articles(html_content, section=name, backend=backend)
+
+def crawl_sections(sections, concurrency=4, session=None, cache=None, backend="auto", snapshot_dir=None,
+                   pending=None):
+    """
+    Crawl several section pages concurrently through one shared session, with
+    at most `concurrency` requests in flight. Returns {section: articles, None
+    or NOT_MODIFIED} in the same order as `sections`. New validators go into
+    `pending`, see fetch_html.
+    """
+    from concurrent.futures import ThreadPoolExecutor
 
-            for article in articles:
-                writer.writerow({
-                    "timestamp": article["timestamp"].isoformat(),
-                    "formatted_time": article["timestamp"].strftime("%B %d, %Y @ %I:%M %p"),
-                    "title": article["title"],
-                    "url": article["url"],
-                    "summary": article["summary"]
-                })
+    concurrency = max(1, concurrency)
+    session = session or create_session(concurrency)
 
-    except Exception as e:
-        print(f"Error writing to CSV: {e}")
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {
+            name: pool.submit(crawl_section, name, path, session, cache, backend, snapshot_dir, pending)
+            for name, path in sections.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
 
-def main():
+def store_articles(articles, store):
+    """
+    Save crawled articles to the store and add the new ones to its keyword
+    index, if it has one. Returns the articles that weren't stored yet.
+    """
+    new_articles = save_articles(articles, store)
+    logging.info(f"Saved {len(new_articles)} new of {len(articles)} articles to {store}")
+
+    if new_articles and os.path.exists(keyword_index_path(store)):
+        from keyword_index import index_new_articles
+
+        index_new_articles(store, new_articles)
+        logging.info(f"Indexed {len(new_articles)} new articles in {keyword_index_path(store)}")
+    return new_articles
+
+def jittered(interval, jitter=0.1):
+    """
+    `interval` seconds, randomly stretched or shrunk by up to `jitter` of itself
+    so that sections sharing a cadence drift apart instead of firing together.
+    """
+    import random
+
+    return interval * (1 + random.uniform(-jitter, jitter))
+
+def run_daemon(sections, store, interval=60, section_intervals=None, jitter=0.1, concurrency=4,
+               cache=None, backend="auto", snapshot_dir=None, stop=None, on_new_articles=None):
+    """
+    Crawl `sections` ({name: path}) forever, each one again every `interval`
+    seconds (or its own entry in `section_intervals`), jittered. The HTTP
+    session, its open connections and the parser stay warm across crawls.
+    Sections falling due together are fetched concurrently. Runs until
+    KeyboardInterrupt, or until the `stop` threading.Event is set.
+    After each crawl that stored new articles, on_new_articles(articles) is
+    called with them.
+    """
+    import heapq
+    import threading
+    import time
+
+    section_intervals = section_intervals or {}
+    stop = stop or threading.Event()
+    session = get_session(concurrency)
+    backend = resolve_parser_backend(backend)
+
+    # (next crawl time, section name), earliest first
+    schedule = [(time.monotonic(), name) for name in sections]
+    heapq.heapify(schedule)
+
+    while schedule and not stop.is_set():
+        delay = schedule[0][0] - time.monotonic()
+        if delay > 0 and stop.wait(delay):
+            break
+
+        now = time.monotonic()
+        due = {}
+        while schedule and schedule[0][0] <= now:
+            _, name = heapq.heappop(schedule)
+            due[name] = sections[name]
+
+        for name in due:
+            heapq.heappush(schedule, (now + jittered(section_intervals.get(name, interval), jitter), name))
+
+        # A failed crawl is logged and retried on the sections' next turn
+        try:
+            truncate_large_log()
+            articles = []
+            pending = {}
+            results = crawl_sections(due, concurrency, session, cache, backend, snapshot_dir, pending)
+            for name, section_articles in results.items():
+                if section_articles is None:
+                    logging.warning(f"Could not fetch section {name}")
+                elif section_articles is not NOT_MODIFIED:
+                    articles.extend(section_articles)
+
+            new_articles = store_articles(articles, store) if articles else []
+            if new_articles and on_new_articles is not None:
+                on_new_articles(new_articles)
+            if cache is not None:
+                cache.update(pending)
+                save_http_cache(cache)
+        except Exception:
+            logging.exception(f"Crawl of {', '.join(due)} failed")
+            print(f"[{datetime.now():%H:%M:%S}] Crawl of {', '.join(due)} failed, see {log_file()}")
+            continue
+
+        print(f"[{datetime.now():%H:%M:%S}] Crawled {', '.join(due)}: {len(new_articles)} new articles")
+
+def main(argv=None):
     """
     Main function to run the crawler.
     """
-    target_url = "https://www.reuters.com"
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Crawl Reuters headlines")
+    parser.add_argument("--store", default="reuters_articles.csv",
+                        help="Article CSV file, SQLite database (.db/.sqlite) or Parquet archive (.parquet)")
+    parser.add_argument("--sections", nargs="*", metavar="SECTION",
+                        help="Crawl these sections from sections.json (all of them if none are named)")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Maximum number of section pages fetched at the same time")
+    parser.add_argument("--no-http-cache", action="store_true",
+                        help="Always download and parse pages, even if they look unchanged")
+    parser.add_argument("--parser", choices=PARSER_BACKENDS, default="auto",
+                        help="HTML parser for story cards (auto: lxml when installed, else strainer)")
+    parser.add_argument("--save-html", metavar="DIR",
+                        help="Also save each fetched page in DIR, e.g. benchmarks/snapshots")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Keep running and crawl again on a schedule instead of exiting after one crawl")
+    parser.add_argument("--interval", type=float, default=60, metavar="SECONDS",
+                        help="Daemon: seconds between crawls of a section without its own interval in sections.json")
+    parser.add_argument("--jitter", type=float, default=0.1, metavar="FRACTION",
+                        help="Daemon: randomly vary each interval by up to this fraction of it")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Run the crawl in a fresh interpreter and report its run time and slowest imports")
+    args = parser.parse_args(argv)
+
+    if args.profile_startup:
+        from startup_profile import profile_startup
+
+        return profile_startup(__file__, sys.argv[1:] if argv is None else argv)
 
     logging.info("Started crawler")
-    print(f"Fetching articles from {target_url}...")
+    cache = None if args.no_http_cache else load_http_cache()
 
-    html_content = fetch_html(target_url)
+    if args.daemon:
+        if args.sections is None:
+            # An empty path is BASE_URL itself, the same page a one-shot crawl reads
+            sections = {"home": ""}
+        else:
+            sections = select_sections(args.sections)
 
-    if html_content is not None:
-        articles = parse_articles(html_content)
+        print(f"Crawling {', '.join(sections)} every {args.interval:g}s (Ctrl+C to stop)...")
+        logging.info(f"Started crawler daemon for {len(sections)} sections")
+        try:
+            run_daemon(sections, args.store, args.interval, load_section_intervals(), args.jitter,
+                       args.concurrency, cache, args.parser, args.save_html)
+        except KeyboardInterrupt:
+            logging.info("Stopped crawler daemon")
+            print("Stopped.")
+        return
+
+    # Validators of the fetched pages, only cached once their articles are stored
+    pending = {}
 
-        print(f"Found {len(articles)} articles.")
-        for article in articles:
-            print(f"{article['timestamp']} — {article['title']}")
+    if args.sections is None:
+        print(f"Fetching articles from {BASE_URL}...")
 
-        save_to_csv(articles)
-        print("Articles saved to CSV.")
+        html_content = fetch_html(BASE_URL, cache=cache, pending=pending)
+        if html_content is NOT_MODIFIED:
+            logging.info("Homepage not modified since last crawl")
+            print("Page not modified since last crawl.")
+            return
+        if html_content is None:
+            print("Could not fetch or parse HTML.")
+            return
+        if args.save_html:
+            save_snapshot(html_content, "home", args.save_html)
+
+        articles = parse_articles(html_content, section="home", backend=args.parser)
     else:
-        print("Could not fetch or parse HTML.")
+        sections = select_sections(args.sections)
+
+        print(f"Fetching {len(sections)} sections with up to {args.concurrency} concurrent requests...")
+
+        articles = []
+        results = crawl_sections(sections, args.concurrency, get_session(args.concurrency), cache,
+                                 args.parser, args.save_html, pending)
+        for name, section_articles in results.items():
+            if section_articles is NOT_MODIFIED:
+                print(f"{name}: not modified")
+                continue
+            if section_articles is None:
+                logging.warning(f"Could not fetch section {name}")
+                print(f"Could not fetch or parse section '{name}'.")
+                continue
+            print(f"{name}: {len(section_articles)} articles")
+            articles.extend(section_articles)
+
+    print(f"Found {len(articles)} articles.")
+    for article in articles:
+        print(f"{article['timestamp']} — {article['title']}")
+
+    new_articles = store_articles(articles, args.store)
+    print(f"Saved {len(new_articles)} new articles to {args.store}.")
+
+    if cache is not None:
+        cache.update(pending)
+        save_http_cache(cache)
 
 # Run the script
 if __name__ == "__main__":
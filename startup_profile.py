@@ -0,0 +1,58 @@
+import re
+import subprocess
+import sys
+import time
+
+# One line of `python -X importtime` output: self and cumulative microseconds,
+# then the module name indented by two spaces per nesting level
+IMPORT_TIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$")
+
+
+def parse_import_times(lines):
+    """
+    (module, self seconds, cumulative seconds, depth) for each -X importtime
+    line, in the order they were printed. Other lines are skipped.
+    """
+    imports = []
+    for line in lines:
+        match = IMPORT_TIME_RE.match(line.rstrip("\n"))
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append((module, int(self_us) / 1e6, int(cumulative_us) / 1e6, (len(indent) - 1) // 2))
+    return imports
+
+
+def import_seconds(imports):
+    """
+    Total time spent importing modules, from parse_import_times() results.
+    """
+    return sum(cumulative for _, _, cumulative, depth in imports if depth == 0)
+
+
+def profile_startup(script, argv, top=15):
+    """
+    Run `script` with `argv` (minus --profile-startup) in a fresh interpreter
+    under -X importtime, then print its total run time, the time spent on
+    imports and the slowest top-level imports. Returns its exit code.
+    """
+    argv = [arg for arg in argv if arg != "--profile-startup"]
+
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", script, *argv],
+                            stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+
+    lines = result.stderr.splitlines()
+    imports = parse_import_times(lines)
+    for line in lines:
+        if not line.startswith("import time:"):
+            print(line, file=sys.stderr)
+
+    print(f"\nStartup profile of {script}:")
+    print(f"  run time    {elapsed * 1000:8.1f} ms (interpreter start included)")
+    print(f"  imports     {import_seconds(imports) * 1000:8.1f} ms")
+    print("  slowest top-level imports:")
+    top_level = sorted((i for i in imports if i[3] == 0), key=lambda i: i[2], reverse=True)
+    for module, _, cumulative, _ in top_level[:top]:
+        print(f"    {cumulative * 1000:8.1f} ms  {module}")
+    return result.returncode
@@ -0,0 +1,354 @@
+import csv
+import heapq
+from bisect import bisect_right
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from html import escape
+
+from article_store import (
+    ARCHIVE_COLUMNS, archive_fallback_csv, connect_sqlite_readonly, has_pyarrow, is_archive_path,
+    is_sqlite_path, list_partitions, select_articles_sql, to_utc
+)
+from digest_render import ARTICLE_TEMPLATE, SUMMARY_TEMPLATE, digest_sections, time_strings
+
+# Fields pandas.read_csv reads as missing by default, so both engines see the same values
+CSV_NA_VALUES = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"
+])
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def timestamp_micros(value):
+    """
+    Microseconds since the epoch of an ISO 8601 string or a datetime, in UTC
+    with naive values taken as UTC. None if the value doesn't parse.
+    """
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if value is None:
+        return None
+    return (to_utc(value) - EPOCH) // timedelta(microseconds=1)
+
+
+def stream_csv_articles(path, since=None, until=None):
+    """
+    (timestamp, title, url, summary) of the rows of an article CSV in
+    [since, until), read one at a time. Timestamps are microseconds since
+    the epoch, missing fields None. Repeated URLs are skipped.
+    """
+    floor = None
+    if since is not None:
+        # Same text prefilter as generate_digest.window_rows
+        floor = (to_utc(since) - timedelta(days=1)).strftime("%Y-%m-%d")
+    since = timestamp_micros(since)
+    until = timestamp_micros(until)
+    seen = set()
+
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        for row in csv.reader(file):
+            if not row:
+                continue
+            row = [None if field in CSV_NA_VALUES else field for field in row[:6]] + [None] * (6 - len(row))
+            timestamp, _, title, url, summary, _ = row
+
+            if timestamp is None or (floor is not None and timestamp[:10] < floor):
+                continue
+            timestamp = timestamp_micros(timestamp)
+            if timestamp is None or (since is not None and timestamp < since):
+                continue
+            if until is not None and timestamp >= until:
+                continue
+            if url in seen:
+                continue
+            seen.add(url)
+            yield timestamp, title, url, summary
+
+
+def stream_sqlite_articles(path, since=None, until=None):
+    """
+    (timestamp, title, url, summary) of the SQLite store's articles in [since, until).
+    """
+    sql, params = select_articles_sql(since, until)
+    with closing(connect_sqlite_readonly(path)) as conn:
+        for timestamp, title, url, summary in conn.execute(sql, params):
+            timestamp = timestamp_micros(timestamp)
+            if timestamp is not None:
+                yield timestamp, title, url, summary
+
+
+def stream_parquet_articles(root, since=None, until=None):
+    """
+    (timestamp, title, url, summary) of the Parquet archive's articles in
+    [since, until), one day file at a time. Repeated URLs are skipped.
+    """
+    import pyarrow.parquet as pq
+
+    filters = []
+    if since is not None:
+        filters.append(("timestamp", ">=", to_utc(since)))
+    if until is not None:
+        filters.append(("timestamp", "<", to_utc(until)))
+    seen = set()
+
+    for path in list_partitions(root, since, until):
+        table = pq.read_table(path, columns=ARCHIVE_COLUMNS, filters=filters or None)
+        for row in table.to_pylist():
+            if row["url"] in seen:
+                continue
+            seen.add(row["url"])
+            yield timestamp_micros(row["timestamp"]), row["title"], row["url"], row["summary"]
+
+
+def stream_store_articles(store, since=None, until=None):
+    """
+    Stream the articles of a CSV, SQLite or Parquet store in [since, until),
+    like generate_digest.load_articles but one row at a time.
+    """
+    if is_sqlite_path(store):
+        return stream_sqlite_articles(store, since, until)
+    if is_archive_path(store):
+        if has_pyarrow():
+            return stream_parquet_articles(store, since, until)
+        store = archive_fallback_csv(store)
+    return stream_csv_articles(store, since, until)
+
+
+def word_character(char):
+    """
+    True for the characters re's \\w matches: alphanumerics and "_".
+    """
+    return char.isalnum() or char == "_"
+
+
+class KeywordCounter:
+    """
+    Pure-Python KeywordMatcher: the same case-insensitive, whole-word and
+    non-overlapping matches, found with str.find on a chunk of texts joined
+    by newlines.
+    """
+
+    def __init__(self, topics):
+        self.keywords = []
+        self.weights = []
+        self.keyword_topics = []
+        ids = {}
+
+        for topic_number, keywords in enumerate(topics.values()):
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if not keyword:
+                    continue
+                if keyword not in ids:
+                    ids[keyword] = len(self.keywords)
+                    self.keywords.append(keyword)
+                    self.weights.append(0)
+                    self.keyword_topics.append(set())
+                self.weights[ids[keyword]] += 1
+                self.keyword_topics[ids[keyword]].add(topic_number)
+
+        self.overlapping = [
+            any(keyword.startswith(keyword[i:]) for i in range(1, len(keyword))) for keyword in self.keywords
+        ]
+
+    def match_texts(self, texts):
+        """
+        (text number, keyword id) of every counted match in a list of lowercased strings.
+        """
+        offsets = []
+        offset = 0
+        for text in texts:
+            offsets.append(offset)
+            offset += len(text) + 1
+        corpus = "\n".join(texts)
+        matches = []
+
+        for keyword_id, keyword in enumerate(self.keywords):
+            length = len(keyword)
+            step = 1 if self.overlapping[keyword_id] else length
+            last_end = -1
+            start = corpus.find(keyword)
+            while start != -1:
+                end = start + length - 1
+                text_number = bisect_right(offsets, start) - 1
+                if (start > last_end
+                        and text_number == bisect_right(offsets, end) - 1
+                        and (start == 0 or not word_character(corpus[start - 1]))
+                        and (end + 1 == len(corpus) or not word_character(corpus[end + 1]))):
+                    matches.append((text_number, keyword_id))
+                    last_end = end
+                start = corpus.find(keyword, start + step)
+        return matches
+
+
+class Article:
+    """
+    One digest row, kept only while a section may still list it.
+    """
+
+    __slots__ = ("position", "timestamp", "title", "url", "summary", "score")
+
+    def __init__(self, position, timestamp, title, url, summary):
+        self.position = position
+        self.timestamp = timestamp
+        self.title = title
+        self.url = url
+        self.summary = summary
+        self.score = 0
+
+
+class StreamedDigest:
+    """
+    The digest of a stream of articles, built without pandas. Only the
+    articles a section can list are kept: the latest top_n in a heap, and
+    the ones matching a topic (which are also the only ones with a hotness
+    score above 0). Renders the same HTML as the DataFrame engine.
+    """
+
+    def __init__(self, topics, top_n=3, chunk_size=2000):
+        self.counter = KeywordCounter(topics)
+        self.topics = list(topics)
+        self.top_n = top_n
+        self.chunk_size = chunk_size
+        self.count = 0
+        self.earliest = None
+        self.latest = None
+        self.recent = []
+        self.matched = []
+        self.topic_articles = [[] for _ in self.topics]
+
+    @property
+    def empty(self):
+        return self.count == 0
+
+    def add(self, rows):
+        """
+        Consume (timestamp, title, url, summary) rows, in store order.
+        """
+        chunk = []
+        for timestamp, title, url, summary in rows:
+            chunk.append(Article(self.count, timestamp, title, url, summary))
+            self.count += 1
+            if len(chunk) == self.chunk_size:
+                self.add_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.add_chunk(chunk)
+        return self
+
+    def add_chunk(self, chunk):
+        texts = []
+        for article in chunk:
+            texts.append((article.title or "").lower())
+            texts.append((article.summary or "").lower())
+
+        topic_hits = {}
+        for text_number, keyword_id in self.counter.match_texts(texts):
+            article = chunk[text_number // 2]
+            article.score += self.counter.weights[keyword_id]
+            topic_hits.setdefault(article.position, set()).update(self.counter.keyword_topics[keyword_id])
+
+        for article in chunk:
+            timestamp = article.timestamp
+            if self.earliest is None or timestamp < self.earliest:
+                self.earliest = timestamp
+            if self.latest is None or timestamp > self.latest:
+                self.latest = timestamp
+
+            # Latest first, the earlier row first among equal timestamps
+            if self.top_n > 0:
+                entry = (timestamp, -article.position, article)
+                if len(self.recent) < self.top_n:
+                    heapq.heappush(self.recent, entry)
+                elif entry[:2] > self.recent[0][:2]:
+                    heapq.heapreplace(self.recent, entry)
+
+            hits = topic_hits.get(article.position)
+            if hits:
+                self.matched.append(article)
+                for topic_number in hits:
+                    self.topic_articles[topic_number].append(article)
+
+    def top_recent(self):
+        return [article for *_, article in sorted(self.recent, key=lambda entry: entry[:2], reverse=True)]
+
+    def top_hot(self):
+        """
+        The top_n articles by recency times keyword score, computed like
+        generate_digest.hotness_scores.
+        """
+        total_seconds = (self.latest - self.earliest) / 1e6 if self.count else 0
+        hotness = {}
+        for article in self.matched:
+            recency = (article.timestamp - self.earliest) / 1e6 / total_seconds if total_seconds else 1.0
+            if recency * article.score > 0:
+                hotness[article.position] = recency * article.score
+        hot = [article for article in self.matched if article.position in hotness]
+        return heapq.nlargest(max(self.top_n, 0), hot, key=lambda article: hotness[article.position])
+
+    def sections(self, topics, top_n):
+        """
+        digest_sections of the streamed articles, with section_urls and
+        render_articles for digest_render.iter_sections_html.
+        """
+        topic_positions = {
+            topic: articles for topic, articles in zip(self.topics, self.topic_articles) if articles
+        }
+        sections = digest_sections(topics, top_n, self.top_recent(), self.top_hot(), topic_positions)
+
+        def section_urls(articles):
+            return [article.url or "" for article in articles]
+
+        def render_articles(stale):
+            # Each article is formatted once, however many sections list it
+            html = {}
+            return [iter_streamed_articles_html(articles, html) for articles in stale]
+
+        return sections, section_urls, render_articles
+
+
+def article_html(article):
+    """
+    The list item of one article, as generate_digest.format_articles and
+    generate_digest.iter_articles_html render it. Missing titles and URLs show as "nan".
+    """
+    time = time_strings()[article.timestamp // 60000000 % 1440]
+
+    url = article.url
+    if url is not None:
+        url = url.strip()
+        url = escape("https://www.reuters.com" + url if url.startswith("/") else url)
+
+    title = escape(article.title.strip()) if article.title is not None else None
+
+    summary = escape((article.summary or "").strip())
+    summary = SUMMARY_TEMPLATE.format(summary=summary) if summary else ""
+
+    return "\n" + ARTICLE_TEMPLATE.format(
+        time=time, url="nan" if url is None else url, title="nan" if title is None else title, summary=summary
+    )
+
+
+def iter_streamed_articles_html(articles, html, chunk_size=1000):
+    """
+    Yields the list items of `articles` a chunk at a time, reusing the ones
+    already rendered into the `html` dict.
+    """
+    for start in range(0, len(articles), chunk_size):
+        pieces = []
+        for article in articles[start:start + chunk_size]:
+            if article.position not in html:
+                html[article.position] = article_html(article)
+            pieces.append(html[article.position])
+        yield "".join(pieces)
+
+
+def stream_articles(store, topics, top_n=3, since=None, until=None):
+    """
+    StreamedDigest of the store's articles in [since, until).
+    """
+    return StreamedDigest(topics, top_n).add(stream_store_articles(store, since, until))